@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# this_file: more/mkdocs-plugins/vexy-mkdocs-strip-number-prefix/benchmarks/bench_import.py
+"""Benchmark the startup cost the plugin adds to every ``mkdocs build``.
+
+Each run starts a fresh interpreter that first imports what MkDocs has
+already loaded when it resolves plugin entry points (``mkdocs.config.defaults``
+and ``mkdocs.plugins``) and then the plugin, and reads the cumulative import
+time of the package from ``python -X importtime``.  The median is compared
+against the ``import`` entry of ``baseline.json``.
+
+Usage:
+    python benchmarks/bench_import.py                      # 20 runs
+    python benchmarks/bench_import.py --runs 50 --verbose  # also list slow modules
+    python benchmarks/bench_import.py --update-baseline    # record new baseline
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BASELINE_FILE = Path(__file__).with_name("baseline.json")
+PACKAGE = "mkdocs_strip_number_prefix"
+PRELOADED = "import mkdocs.config.defaults, mkdocs.plugins"
+MARKER = "-- plugin import --"
+
+
+def import_times() -> dict[str, tuple[int, int]]:
+    """Return ``(self, cumulative)`` microseconds of every module the plugin imports."""
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)  # measure with bytecode, as installed
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            f"{PRELOADED}\nimport sys\nprint({MARKER!r}, file=sys.stderr)\nimport {PACKAGE}.plugin",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=env,
+    )
+    # Only the modules imported after the marker are the plugin's own cost.
+    times = {}
+    for line in result.stderr.split(MARKER, 1)[1].splitlines():
+        if not line.startswith("import time:"):
+            continue
+        own, cumulative, name = (part.strip() for part in line[len("import time:") :].split("|"))
+        times[name] = (int(own), int(cumulative))
+    return times
+
+
+def main() -> int:
+    """Run the benchmark and compare it against the baseline."""
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--runs", type=int, default=20, help="interpreter starts to measure")
+    parser.add_argument("--threshold", type=float, default=1.5, help="allowed slowdown factor")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE, help="baseline JSON file")
+    parser.add_argument("--update-baseline", action="store_true", help="record result as baseline")
+    parser.add_argument("--verbose", action="store_true", help="list the slowest modules")
+    args = parser.parse_args()
+
+    import_times()  # warm-up: writes the bytecode caches
+    runs = [import_times() for _ in range(args.runs)]
+    seconds = statistics.median(run[PACKAGE][1] for run in runs) / 1e6
+    print(f"import {PACKAGE}.plugin  {seconds * 1000:8.2f} ms (median of {args.runs} runs)")
+
+    if args.verbose:
+        own = {name: statistics.median(run[name][0] for run in runs) for name in runs[0]}
+        for name, micros in sorted(own.items(), key=lambda item: -item[1])[:10]:
+            print(f"  {micros / 1000:8.2f} ms  {name}")
+
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    if args.update_baseline:
+        baseline["import"] = {PACKAGE: {"seconds": seconds}}
+        args.baseline.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    base = baseline.get("import", {}).get(PACKAGE)
+    if base is None:
+        print(f"No import baseline in {args.baseline}; run with --update-baseline first")
+        return 0
+    if seconds > base["seconds"] * args.threshold:
+        print(
+            f"REGRESSION: import took {seconds * 1000:.2f} ms "
+            f"(baseline {base['seconds'] * 1000:.2f} ms, threshold x{args.threshold})"
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
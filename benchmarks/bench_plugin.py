@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+# this_file: more/mkdocs-plugins/vexy-mkdocs-strip-number-prefix/benchmarks/bench_plugin.py
+r"""Benchmark the plugin hooks on synthetic trees of prefixed pages.
+
+Every hook (``on_files``, ``on_nav`` and ``on_page_markdown``) is measured
+separately for wall time and peak memory, as is ``clean_paths``: cleaning
+every page path with a cold component cache, i.e. the raw cost of the prefix
+matcher.  Results are compared against
+``baseline.json`` and the script exits non-zero when a hook is slower than
+``threshold`` times its baseline.
+
+Usage:
+    python benchmarks/bench_plugin.py                      # 1k and 10k pages
+    python benchmarks/bench_plugin.py --sizes 1000 10000 100000 --depth 4
+    python benchmarks/bench_plugin.py --pattern '^(?:\d+)--'  # regex matcher
+    python benchmarks/bench_plugin.py --update-baseline    # record new baseline
+"""
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable
+
+from mkdocs.config.defaults import MkDocsConfig
+from mkdocs.structure.files import File, Files
+from mkdocs.structure.nav import get_navigation
+from mkdocs.structure.pages import Page
+
+from mkdocs_strip_number_prefix.plugin import StripNumberPrefixPlugin
+from mkdocs_strip_number_prefix.stripper import PrefixStripper
+
+BASELINE_FILE = Path(__file__).with_name("baseline.json")
+DOCS_DIR = "/nonexistent/docs"
+SITE_DIR = "/nonexistent/site"
+
+# Pages per directory; together with the depth this shapes the synthetic tree.
+FANOUT = 10
+
+
+def make_src_paths(size: int, depth: int) -> list[str]:
+    """Return ``size`` prefixed source paths spread over ``depth`` directory levels."""
+    paths = []
+    for n in range(size):
+        parts = []
+        rest = n // FANOUT
+        for _ in range(depth):
+            parts.append(f"{rest % FANOUT + 1:03d}--section-{rest % FANOUT}")
+            rest //= FANOUT
+        parts.append(f"{n % FANOUT + 1:03d}--page-{n}.md")
+        paths.append("/".join(parts))
+    return paths
+
+
+def make_markdown(src_path: str, links: int) -> str:
+    """Return a page body with ``links`` prefixed links to sibling pages."""
+    name = src_path.rsplit("/", 1)[-1]
+    body = [f"# {name}", "", "Some introductory text without links.", ""]
+    body.extend(f"See [page {i}]({i + 1:03d}--page-{i}.md#part) for details." for i in range(links))
+    body.append(f"And [itself]({name}).")
+    return "\n".join(body)
+
+
+def make_config(use_directory_urls: bool = True) -> MkDocsConfig:
+    """Return an (unvalidated) MkDocs config; the synthetic tree never touches disk."""
+    config = MkDocsConfig()
+    config.load_dict(
+        {
+            "site_name": "benchmark",
+            "docs_dir": DOCS_DIR,
+            "site_dir": SITE_DIR,
+            "use_directory_urls": use_directory_urls,
+        }
+    )
+    return config
+
+
+def make_plugin(
+    config: MkDocsConfig, workers: int = 0, pattern: str = r"^\d+--"
+) -> StripNumberPrefixPlugin:
+    """Return a plugin configured like a typical large site."""
+    plugin = StripNumberPrefixPlugin()
+    plugin.load_config(
+        {"strip_links": True, "strip_nav_titles": True, "workers": workers, "pattern": pattern}
+    )
+    plugin.on_config(config)
+    return plugin
+
+
+def measure(prepare: Callable[[], Callable[[], Any]]) -> dict[str, float]:
+    """Return the wall time and peak traced memory of the callable built by ``prepare()``.
+
+    Tracing memory slows Python down considerably, so time and memory are
+    measured in two separate runs, each on freshly prepared state.
+    """
+    func = prepare()
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+
+    func = prepare()
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": elapsed, "peak_bytes": peak}
+
+
+def bench_size(
+    size: int, depth: int, links: int, workers: int, pattern: str
+) -> dict[str, dict[str, float]]:
+    """Benchmark every hook on a tree of ``size`` pages."""
+    config = make_config()
+    use_urls = config["use_directory_urls"]
+    src_paths = make_src_paths(size, depth)
+    results = {}
+
+    def make_files() -> Files:
+        return Files([File(path, DOCS_DIR, SITE_DIR, use_urls) for path in src_paths])
+
+    def prepare_files() -> Callable[[], Any]:
+        plugin, files = make_plugin(config, workers, pattern), make_files()
+        return lambda: plugin.on_files(files, config)
+
+    results["on_files"] = measure(prepare_files)
+
+    # The remaining hooks run on the output of a regular ``on_files`` pass.
+    plugin, files = make_plugin(config, pattern=pattern), make_files()
+    triples = [(file.src_path, file.dest_path, file.url) for file in files]
+
+    def prepare_paths() -> Callable[[], Any]:
+        stripper = PrefixStripper(plugin.prefix_pattern)
+        return lambda: [stripper.clean_file_paths(*triple, "/") for triple in triples]
+
+    results["clean_paths"] = measure(prepare_paths)
+    plugin.on_files(files, config)
+
+    def prepare_nav() -> Callable[[], Any]:
+        nav = get_navigation(files, config)
+        return lambda: plugin.on_nav(nav, config, files)
+
+    results["on_nav"] = measure(prepare_nav)
+
+    pages = [(Page(None, file, config), make_markdown(file.src_path, links)) for file in files]
+
+    def prepare_markdown() -> Callable[[], Any]:
+        def rewrite_all() -> None:
+            for page, markdown in pages:
+                plugin.on_page_markdown(markdown, page, config, files)
+
+        return rewrite_all
+
+    results["on_page_markdown"] = measure(prepare_markdown)
+    return results
+
+
+def compare(
+    results: dict[str, dict[str, dict[str, float]]],
+    baseline: dict[str, dict[str, dict[str, float]]],
+    threshold: float,
+) -> list[str]:
+    """Return a message for every hook slower than ``threshold`` times its baseline."""
+    regressions = []
+    for size, hooks in results.items():
+        for hook, stats in hooks.items():
+            base = baseline.get(size, {}).get(hook)
+            if base and stats["seconds"] > base["seconds"] * threshold:
+                regressions.append(
+                    f"{hook} on {size} pages: {stats['seconds']:.3f}s "
+                    f"(baseline {base['seconds']:.3f}s, threshold x{threshold})"
+                )
+    return regressions
+
+
+def main() -> int:
+    """Run the benchmarks and compare them against the baseline."""
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000], help="page counts")
+    parser.add_argument("--depth", type=int, default=3, help="directory levels above each page")
+    parser.add_argument("--links", type=int, default=5, help="prefixed links per page")
+    parser.add_argument("--workers", type=int, default=0, help="on_files worker processes")
+    parser.add_argument("--pattern", default=r"^\d+--", help="prefix pattern to strip")
+    parser.add_argument("--threshold", type=float, default=1.5, help="allowed slowdown factor")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE, help="baseline JSON file")
+    parser.add_argument("--update-baseline", action="store_true", help="record results as baseline")
+    args = parser.parse_args()
+
+    results = {}
+    for size in args.sizes:
+        results[str(size)] = hooks = bench_size(
+            size, args.depth, args.links, args.workers, args.pattern
+        )
+        for hook, stats in hooks.items():
+            print(
+                f"{size:>7} pages  {hook:<17} {stats['seconds'] * 1000:10.1f} ms "
+                f"{stats['peak_bytes'] / 2**20:8.1f} MiB"
+            )
+
+    if args.update_baseline:
+        baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+        baseline.update(results)
+        args.baseline.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}; run with --update-baseline first")
+        return 0
+
+    regressions = compare(results, json.loads(args.baseline.read_text()), args.threshold)
+    for message in regressions:
+        print(f"REGRESSION: {message}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
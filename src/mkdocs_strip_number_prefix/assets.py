@@ -0,0 +1,71 @@
+# this_file: more/mkdocs-plugins/vexy-mkdocs-strip-number-prefix/src/mkdocs_strip_number_prefix/assets.py  # noqa: E501
+"""Placing relocated static files in the site without copying unchanged bytes."""
+
+import os
+import shutil
+import sys
+
+# Supported ``asset_copy`` strategies; ``copy`` leaves copying to MkDocs.
+COPY_STRATEGIES = ("copy", "skip", "reflink", "hardlink")
+
+# ``ioctl`` request cloning a whole file on copy-on-write filesystems (Btrfs, XFS).
+FICLONE = 0x40049409
+
+
+def is_unchanged(src: str, dest: str) -> bool:
+    """Return whether ``dest`` already holds ``src`` (same file, or same size and mtime)."""
+    try:
+        src_stat = os.stat(src)
+        dest_stat = os.stat(dest)
+    except OSError:
+        return False
+    if os.path.samestat(src_stat, dest_stat):
+        return True
+    return src_stat.st_size == dest_stat.st_size and src_stat.st_mtime_ns == dest_stat.st_mtime_ns
+
+
+def _reflink(src: str, dest: str) -> bool:
+    """Clone ``src`` to ``dest`` sharing its blocks; return ``False`` if unsupported."""
+    if not sys.platform.startswith("linux"):
+        return False
+    import fcntl
+
+    try:
+        with open(src, "rb") as source, open(dest, "wb") as target:
+            fcntl.ioctl(target.fileno(), FICLONE, source.fileno())
+    except OSError:
+        try:
+            os.remove(dest)
+        except OSError:
+            pass
+        return False
+    shutil.copystat(src, dest)
+    return True
+
+
+def place_file(src: str, dest: str, strategy: str) -> str:
+    """Make ``dest`` a copy of ``src`` using ``strategy``; return what was done.
+
+    Unchanged destinations are left alone (``"skipped"``).  Otherwise the file
+    is reflinked (``"reflinked"``) or hardlinked (``"linked"``) when the
+    strategy asks for it and the filesystem allows it, and copied with its
+    mtime (``"copied"``) as a fallback, so the next build can skip it.
+    """
+    if is_unchanged(src, dest):
+        return "skipped"
+
+    os.makedirs(os.path.dirname(dest), exist_ok=True)
+    if os.path.lexists(dest):
+        os.remove(dest)  # stale copy; never write through an old hardlink
+
+    if strategy == "hardlink":
+        try:
+            os.link(src, dest)
+            return "linked"
+        except OSError:
+            pass
+    elif strategy == "reflink" and _reflink(src, dest):
+        return "reflinked"
+
+    shutil.copy2(src, dest)
+    return "copied"
@@ -0,0 +1,213 @@
+# this_file: more/mkdocs-plugins/vexy-mkdocs-strip-number-prefix/src/mkdocs_strip_number_prefix/cache.py  # noqa: E501
+"""Persistent caches of cleaned paths and rewritten markdown shared between builds."""
+
+import json
+import logging
+import os
+from collections import OrderedDict
+from importlib.metadata import PackageNotFoundError, version
+from typing import Any, Optional
+
+logger = logging.getLogger(f"mkdocs.plugins.{__name__}")
+
+DISTRIBUTION = "vexy-mkdocs-strip-number-prefix"
+CACHE_FILENAME = "paths.json"
+LINK_CACHE_FILENAME = "links.json"
+
+
+def _plugin_version() -> str:
+    """Return the installed plugin version, so an upgrade invalidates every cache."""
+    try:
+        return version(DISTRIBUTION)
+    except PackageNotFoundError:
+        return "0.0.0+unknown"
+
+
+def _read_cache(path: str, version: str, signature: str) -> Optional[dict[str, Any]]:
+    """Return the cache data stored at ``path``, or ``None`` if missing, corrupt or stale.
+
+    Data that is not a JSON object is treated as stale; callers check the
+    shape of the entries themselves.
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"StripNumberPrefix: Ignoring unreadable cache '{path}': {e}")
+        return None
+
+    if (
+        not isinstance(data, dict)
+        or data.get("version") != version
+        or data.get("signature") != signature
+    ):
+        # Settings or plugin changed since the cache was written: start over.
+        return None
+    return dict(data)
+
+
+def _is_path_entry(paths: object) -> bool:
+    """Return whether ``paths`` is a stored ``[virtual path, dest_path, url]`` triple."""
+    return isinstance(paths, list) and len(paths) == 3 and all(isinstance(p, str) for p in paths)
+
+
+def _is_link_entry(entry: object) -> bool:
+    """Return whether ``entry`` is a stored ``[key, rewritten or None, links]`` record."""
+    if not isinstance(entry, list) or len(entry) != 3:
+        return False
+    key, rewritten, links = entry
+    return (
+        isinstance(key, str)
+        and (rewritten is None or isinstance(rewritten, str))
+        and isinstance(links, int)
+    )
+
+
+def _write_cache(path: str, data: dict[str, Any]) -> bool:
+    """Atomically write ``data`` to ``path``; return whether it succeeded."""
+    tmp_path = f"{path}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"StripNumberPrefix: Could not write cache '{path}': {e}")
+        return False
+    return True
+
+
+class PathCache:
+    """Maps ``src_path`` to its cleaned ``(virtual path, dest_path, url)`` triple.
+
+    The cache is stored as a single compact JSON file.  It is tagged with the
+    plugin version and a *signature* describing every setting that influences
+    the cleaned paths (e.g. the prefix pattern); a mismatch on load discards
+    the stored entries so stale results are never reused.
+    """
+
+    def __init__(self, cache_dir: str, signature: str) -> None:
+        """Create a cache rooted at ``cache_dir`` for the given signature."""
+        self.path = os.path.join(cache_dir, CACHE_FILENAME)
+        self.signature = signature
+        self.version = _plugin_version()
+        self.entries: dict[str, tuple[str, str, str]] = {}
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+
+    def load(self) -> None:
+        """Load entries from disk, ignoring missing, corrupt or stale files."""
+        data = _read_cache(self.path, self.version, self.signature)
+        entries = data.get("entries", {}) if data is not None else None
+        if not isinstance(entries, dict) or not all(map(_is_path_entry, entries.values())):
+            # Missing, stale or malformed: rewritten from scratch on save.
+            self._dirty = os.path.exists(self.path)
+            return
+
+        self.entries = {src: tuple(paths) for src, paths in entries.items()}
+
+    def get(self, src_path: str) -> Optional[tuple[str, str, str]]:
+        """Return the cached triple for ``src_path`` or ``None``."""
+        entry = self.entries.get(src_path)
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def put(self, src_path: str, virtual_path: str, dest_path: str, url: str) -> None:
+        """Store the cleaned triple for ``src_path``."""
+        entry = (virtual_path, dest_path, url)
+        if self.entries.get(src_path) != entry:
+            self.entries[src_path] = entry
+            self._dirty = True
+
+    def save(self) -> None:
+        """Write the cache back to disk if anything changed."""
+        if not self._dirty:
+            return
+
+        data = {"version": self.version, "signature": self.signature, "entries": self.entries}
+        if _write_cache(self.path, data):
+            self._dirty = False
+
+
+class LinkCache:
+    """Size-bounded LRU of rewritten markdown, keyed by page and content digest.
+
+    Every entry was produced from one version of the ``src -> clean`` link
+    map; the digest of that map is the cache's *generation* and a new
+    generation drops all entries.  When ``cache_dir`` is given the entries
+    are also kept on disk (next to the path cache) for the next build.
+    """
+
+    def __init__(self, maxsize: int, signature: str, cache_dir: Optional[str] = None) -> None:
+        """Create an empty cache holding at most ``maxsize`` pages."""
+        self.maxsize = maxsize
+        self.signature = signature
+        self.path = os.path.join(cache_dir, LINK_CACHE_FILENAME) if cache_dir else None
+        self.version = _plugin_version()
+        self.generation = ""
+        self.entries: OrderedDict[str, tuple[Optional[str], int]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+
+    def load(self) -> None:
+        """Load entries from disk, ignoring missing, corrupt or stale files."""
+        if self.path is None:
+            return
+        data = _read_cache(self.path, self.version, self.signature)
+        if data is None:
+            return
+        generation = data.get("generation", "")
+        entries = data.get("entries", [])
+        if not isinstance(generation, str) or not isinstance(entries, list):
+            return
+        if not all(map(_is_link_entry, entries)):
+            return
+
+        self.generation = generation
+        self.entries = OrderedDict((key, (rewritten, links)) for key, rewritten, links in entries)
+
+    def set_generation(self, generation: str) -> None:
+        """Switch to the link map identified by ``generation``, dropping stale entries."""
+        if generation != self.generation:
+            self.generation = generation
+            self.entries.clear()
+            self._dirty = True
+
+    def get(self, key: str) -> Optional[tuple[Optional[str], int]]:
+        """Return ``(rewritten or None if unchanged, links rewritten)`` for ``key``."""
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.entries.move_to_end(key)
+        return entry
+
+    def put(self, key: str, rewritten: Optional[str], links: int) -> None:
+        """Store the rewrite result for ``key``, evicting the least recently used pages."""
+        self.entries[key] = (rewritten, links)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+        self._dirty = True
+
+    def save(self) -> None:
+        """Write the cache back to disk if it is persistent and anything changed."""
+        if self.path is None or not self._dirty:
+            return
+
+        data = {
+            "version": self.version,
+            "signature": self.signature,
+            "generation": self.generation,
+            "entries": [[key, rewritten, links] for key, (rewritten, links) in self.entries.items()],
+        }
+        if _write_cache(self.path, data):
+            self._dirty = False
@@ -0,0 +1,27 @@
+# this_file: more/mkdocs-plugins/vexy-mkdocs-strip-number-prefix/src/mkdocs_strip_number_prefix/collisions.py  # noqa: E501
+"""Structured report of source files that map to the same clean path."""
+
+
+class CollisionReport(dict[str, list[str]]):
+    """Maps each contested clean path to the source files claiming it.
+
+    Entries are added as soon as a second claimant shows up while files
+    stream through ``on_files`` and dropped again once a rebuild leaves a
+    single claimant, so the report always reflects the current build.
+    """
+
+    def record(self, clean_path: str, sources: list[str]) -> bool:
+        """Update the entry for ``clean_path``; return whether it is a collision."""
+        if len(sources) > 1:
+            self[clean_path] = sources
+            return True
+        self.pop(clean_path, None)
+        return False
+
+    def message(self, clean_path: str) -> str:
+        """Describe the collision on ``clean_path``."""
+        return f"Multiple files would map to '{clean_path}': {', '.join(self[clean_path])}"
+
+    def messages(self) -> list[str]:
+        """Describe every collision in the report."""
+        return [self.message(clean_path) for clean_path in self]
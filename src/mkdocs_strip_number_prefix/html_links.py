@@ -0,0 +1,121 @@
+# this_file: more/mkdocs-plugins/vexy-mkdocs-strip-number-prefix/src/mkdocs_strip_number_prefix/html_links.py  # noqa: E501
+"""Rewriting of prefixed ``href``/``src`` attributes in rendered page HTML."""
+
+import posixpath
+import re
+from typing import Optional
+
+from mkdocs.utils import get_relative_url
+
+# Start tags carrying an ``href`` or ``src`` attribute.  Text is escaped in
+# rendered HTML, so only real tags can match.
+TAG_PATTERN = re.compile(r"<[a-zA-Z][^>]*?\s(?:href|src)\s*=[^>]*>", re.IGNORECASE)
+
+# The ``href``/``src`` attributes of a tag; the value is in one of three groups.
+ATTRIBUTE_PATTERN = re.compile(
+    r"""\s(?:href|src)\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'=<>`]+))""", re.IGNORECASE
+)
+
+# URLs with a scheme (``https:``, ``mailto:``, ``data:``...) never point at a page.
+SCHEME_PATTERN = re.compile(r"^[a-zA-Z][a-zA-Z0-9+.-]*:")
+
+
+class HtmlLinkRewriter:
+    """Rewrites prefixed URLs in rendered HTML using a ``src -> (old URL, new URL)`` map.
+
+    ``url_map`` maps the ``/``-separated source path of every transformed page
+    to the URL MkDocs would have published it under and the URL it is
+    published under now.  Attribute values pointing at an old URL (or at the
+    page's ``.md`` source) are replaced by the new URL, relative to the page.
+    """
+
+    def __init__(self, url_map: dict[str, tuple[str, str]]) -> None:
+        """Create a rewriter for ``url_map``."""
+        self.url_map = url_map
+        self._by_url = dict(url_map.values())
+
+    @staticmethod
+    def may_contain_links(html: str) -> bool:
+        """Cheap prefilter: pages without any ``href``/``src`` attribute skip the scanner."""
+        return "href" in html or "src" in html
+
+    def rewrite(
+        self, html: str, page_src: Optional[str], page_url: str
+    ) -> tuple[str, list[tuple[str, str]]]:
+        """Rewrite the attributes of a page; return the HTML and the ``(old, new)`` URL pairs.
+
+        ``page_src`` is the ``/``-separated source path of the page, if known,
+        and ``page_url`` the URL it is published under.
+        """
+        old_page_url = page_url
+        if page_src is not None and page_src in self.url_map:
+            old_page_url = self.url_map[page_src][0]
+        src_dir = posixpath.dirname(page_src) if page_src is not None else ""
+        url_dir = old_page_url.rsplit("/", 1)[0] if "/" in old_page_url else ""
+        rewrites: list[tuple[str, str]] = []
+
+        pieces = []
+        last = 0
+        for tag in TAG_PATTERN.finditer(html):
+            for attribute in ATTRIBUTE_PATTERN.finditer(html, tag.start(), tag.end()):
+                value_group = attribute.lastindex or 0
+                value = attribute.group(value_group)
+                new_value = self._rewrite_url(value, src_dir, url_dir, page_url)
+                if new_value is None:
+                    continue
+                rewrites.append((value, new_value))
+                start, end = attribute.span(value_group)
+                pieces.append(html[last:start])
+                pieces.append(new_value)
+                last = end
+
+        if not rewrites:
+            return html, rewrites
+        pieces.append(html[last:])
+        return "".join(pieces), rewrites
+
+    def _rewrite_url(self, value: str, src_dir: str, url_dir: str, page_url: str) -> Optional[str]:
+        """Return the rewritten form of an attribute ``value``, or ``None`` to keep it."""
+        if not value or value.startswith(("#", "//")) or SCHEME_PATTERN.match(value):
+            return None
+
+        # Keep the query string and fragment as they are.
+        cut = len(value)
+        for marker in ("?", "#"):
+            index = value.find(marker)
+            if index != -1:
+                cut = min(cut, index)
+        path, suffix = value[:cut], value[cut:]
+        if not path:
+            return None
+
+        absolute = path.startswith("/")
+        if path.endswith(".md"):
+            # Raw HTML can still point at a page's source file.
+            target = self._resolve(path, src_dir, absolute)
+            entry = self.url_map.get(target) if target is not None else None
+            new_url = entry[1] if entry is not None else None
+        else:
+            target = self._resolve(path, url_dir, absolute)
+            if target and path.endswith("/"):
+                target = f"{target}/"
+            new_url = self._by_url.get(target) if target is not None else None
+
+        if new_url is None:
+            return None
+        if absolute:
+            return f"/{new_url}{suffix}"
+        return f"{get_relative_url(new_url, page_url)}{suffix}"
+
+    @staticmethod
+    def _resolve(path: str, base: str, absolute: bool) -> Optional[str]:
+        """Resolve ``path`` to a site-root-relative path, or ``None`` if it leaves the site."""
+        if absolute:
+            target = posixpath.normpath(path)[1:]
+        else:
+            target = posixpath.normpath(posixpath.join(base, path))
+        if target == ".":
+            return ""
+        if target.startswith(".."):
+            return None
+        return target
@@ -0,0 +1,162 @@
+# this_file: more/mkdocs-plugins/vexy-mkdocs-strip-number-prefix/src/mkdocs_strip_number_prefix/index.py  # noqa: E501
+"""Trie of source path components and their cleaned counterparts."""
+
+from typing import Optional
+
+
+class _Node:
+    """One path component in the trie."""
+
+    __slots__ = ("children", "clean", "files", "is_file", "parent")
+
+    def __init__(self, clean: str, parent: Optional["_Node"]) -> None:
+        self.clean = clean
+        self.parent = parent
+        self.children: dict[str, _Node] = {}
+        self.files = 0  # number of indexed files at or below this node
+        self.is_file = False
+
+
+class PathIndex:
+    """Queryable index of documentation paths, built once per build in ``on_files``.
+
+    Pages in the same folder share their prefixed parents, so the index stores
+    every source component once, together with its cleaned name.  Source paths
+    resolve to clean paths (and clean paths back to their sources) by walking
+    at most ``depth`` nodes, without running the prefix regex again or building
+    ``Path`` objects.
+    """
+
+    def __init__(self, sep: str = "/") -> None:
+        """Create an empty index for paths separated by ``sep``."""
+        self.sep = sep
+        self._root = _Node("", None)
+        # Clean paths almost always have a single source, so only the first one
+        # is stored; later claimants (collisions) are kept on the side.
+        self._first: dict[str, str] = {}
+        self._more: dict[str, list[str]] = {}
+
+    def __len__(self) -> int:
+        """Return the number of indexed files."""
+        return self._root.files
+
+    def __contains__(self, src_path: object) -> bool:
+        """Return whether ``src_path`` is an indexed file."""
+        node = self._find(src_path) if isinstance(src_path, str) else None
+        return node is not None and node.is_file
+
+    def _find(self, path: str) -> Optional[_Node]:
+        """Return the node for the source ``path`` or ``None``."""
+        node = self._root
+        if path:
+            for part in path.split(self.sep):
+                child = node.children.get(part)
+                if child is None:
+                    return None
+                node = child
+        return node
+
+    def add(self, src_path: str, clean_path: str) -> list[str]:
+        """Index ``src_path`` as producing ``clean_path``; return all sources of ``clean_path``.
+
+        ``clean_path`` must be the component-wise cleaned version of ``src_path``.
+        """
+        node = self._root
+        node.files += 1
+        for part, clean in zip(src_path.split(self.sep), clean_path.split(self.sep)):
+            child = node.children.get(part)
+            if child is None:
+                child = node.children[part] = _Node(clean, node)
+            child.files += 1
+            node = child
+        node.is_file = True
+
+        first = self._first.setdefault(clean_path, src_path)
+        if first == src_path:
+            return [src_path]
+        more = self._more.setdefault(clean_path, [])
+        more.append(src_path)
+        return [first, *more]
+
+    def remove(self, src_path: str) -> list[str]:
+        """Drop ``src_path`` from the index; return the remaining sources of its clean path."""
+        node = self._find(src_path)
+        if node is None or not node.is_file:
+            raise KeyError(src_path)
+
+        clean_path = self._clean_path(node)
+        node.is_file = False
+        parts = src_path.split(self.sep)
+        while node.parent is not None:
+            node.files -= 1
+            parent = node.parent
+            if not node.files:
+                del parent.children[parts[-1]]
+            parts.pop()
+            node = parent
+        node.files -= 1
+
+        more = self._more.get(clean_path)
+        if self._first[clean_path] != src_path:
+            more.remove(src_path)  # type: ignore[union-attr]
+        elif more:
+            self._first[clean_path] = more.pop(0)
+        else:
+            del self._first[clean_path]
+        if more is not None and not more:
+            del self._more[clean_path]
+        return self.sources(clean_path)
+
+    def _clean_path(self, node: _Node) -> str:
+        """Return the cleaned path leading to ``node``."""
+        parts = []
+        while node.parent is not None:
+            parts.append(node.clean)
+            node = node.parent
+        return self.sep.join(reversed(parts))
+
+    def clean(self, src_path: str) -> Optional[str]:
+        """Return the cleaned path of an indexed file or directory, or ``None``."""
+        node = self._find(src_path)
+        return None if node is None else self._clean_path(node)
+
+    def sources(self, clean_path: str) -> list[str]:
+        """Return the source files that map to ``clean_path`` (more than one is a collision)."""
+        first = self._first.get(clean_path)
+        if first is None:
+            return []
+        return [first, *self._more.get(clean_path, ())]
+
+    def children(self, src_dir: str = "") -> dict[str, str]:
+        """Map the source names directly below ``src_dir`` to their cleaned names."""
+        node = self._find(src_dir)
+        if node is None:
+            return {}
+        return {name: child.clean for name, child in node.children.items()}
+
+    def clean_link(self, src_dir: str, link: str) -> Optional[str]:
+        """Rewrite the ``/``-separated relative ``link`` from ``src_dir`` with cleaned names.
+
+        Returns ``None`` when the link does not point at an indexed file.
+        """
+        node = self._root if link.startswith("/") else self._find(src_dir)
+        if node is None:
+            return None
+
+        parts = []
+        for part in link.split("/"):
+            if part in ("", "."):
+                parts.append(part)
+            elif part == "..":
+                if node.parent is None:
+                    return None
+                node = node.parent
+                parts.append(part)
+            else:
+                child = node.children.get(part)
+                if child is None:
+                    return None
+                node = child
+                parts.append(child.clean)
+
+        return "/".join(parts) if node.is_file else None
@@ -0,0 +1,261 @@
+# this_file: more/mkdocs-plugins/vexy-mkdocs-strip-number-prefix/src/mkdocs_strip_number_prefix/links.py  # noqa: E501
+"""Rewriting of prefixed markdown links against the map of cleaned page paths."""
+
+import hashlib
+import posixpath
+import re
+from functools import lru_cache
+from pathlib import Path
+from re import Pattern
+from typing import Optional
+from urllib.parse import unquote
+
+from mkdocs.utils import get_relative_url
+
+from mkdocs_strip_number_prefix.stripper import PrefixStripper
+
+# Every link form that can point at a page, as one alternation so a document
+# is tokenized in a single scan.  Each alternative ends with exactly one
+# capturing group around the ``.md`` target (plus an optional anchor), so
+# ``match.lastindex`` locates the target whatever the form.  Raw HTML targets
+# are named ``href``: MkDocs never resolves them, so they need a URL.
+LINK_PATTERN = (
+    r"(?m)"
+    # Inline links, including linked images: [text](target "title"), [![alt](a.png)](target)
+    r"\[(?:[^\[\]\n]|\[[^\]\n]*\])+\]\(<?([^)\s<>]+?\.md(?:#[^)\s<>]*)?)(?=>?[\s)])"
+    # Reference definitions: [id]: target
+    r"|^[ ]{0,3}\[[^\]\n]+\]:[ \t]*<?([^\s<>]+?\.md(?:#[^\s<>]*)?)(?=>?(?:\s|$))"
+    # Autolinks: <target>
+    r"|<([^\s<>]+?\.md(?:#[^\s<>]*)?)>"
+    # Raw HTML anchors: <a href="target">
+    r"|<a\s[^>]*?\bhref=(?P<quote>[\"'])(?P<href>[^\"'\s]+?\.md(?:#[^\"'\s]*)?)(?P=quote)"
+)
+
+# Opening code fences (up to three spaces of indentation).
+FENCE_PATTERN = re.compile(r"^ {0,3}(`{3,}|~{3,})(.*)$", re.MULTILINE)
+
+# Runs of backticks delimiting inline code spans.
+BACKTICKS_PATTERN = re.compile(r"`+")
+
+
+@lru_cache(maxsize=None)
+def _closing_fence(fence: str) -> Pattern[str]:
+    """Return the pattern of a fence closing ``fence`` (same character, at least as long)."""
+    return re.compile(rf"^ {{0,3}}{re.escape(fence[0])}{{{len(fence)},}}[ \t]*$", re.MULTILINE)
+
+
+def _inline_code_spans(markdown: str, start: int, end: int) -> list[tuple[int, int]]:
+    """Return the inline code spans between ``start`` and ``end``.
+
+    A run of backticks opens a span that the next run of the *same* length
+    closes; runs without a partner are literal.  The partner of every run is
+    precomputed in one backwards pass, so this is linear in the number of runs.
+    """
+    runs = [m.span() for m in BACKTICKS_PATTERN.finditer(markdown, start, end)]
+    partner: list[Optional[int]] = [None] * len(runs)
+    next_of_length: dict[int, int] = {}
+    for i in range(len(runs) - 1, -1, -1):
+        length = runs[i][1] - runs[i][0]
+        partner[i] = next_of_length.get(length)
+        next_of_length[length] = i
+
+    spans = []
+    i = 0
+    while i < len(runs):
+        j = partner[i]
+        if j is None:
+            i += 1
+        else:
+            spans.append((runs[i][0], runs[j][1]))
+            i = j + 1
+    return spans
+
+
+def prose_spans(markdown: str) -> list[tuple[int, int]]:
+    """Split ``markdown`` into the ``(start, end)`` ranges outside fenced and inline code.
+
+    Fenced blocks are found line by line and inline code spans within the
+    remaining text, in a single linear pass over the document.
+    """
+    spans = []
+    pos = 0
+    length = len(markdown)
+    while pos < length:
+        fence = FENCE_PATTERN.search(markdown, pos)
+        if fence is not None and fence.group(1)[0] == "`" and "`" in fence.group(2):
+            # Not a fence: backtick fences cannot have backticks in their info string.
+            prose_end = fence.end()
+            code_end = None
+        elif fence is not None:
+            prose_end = fence.start()
+            closing = _closing_fence(fence.group(1)).search(markdown, fence.end() + 1)
+            code_end = closing.end() if closing is not None else length  # unclosed: to the end
+        else:
+            prose_end = length
+            code_end = None
+
+        for code_start, code_stop in _inline_code_spans(markdown, pos, prose_end):
+            if code_start > pos:
+                spans.append((pos, code_start))
+            pos = code_stop
+        if prose_end > pos:
+            spans.append((pos, prose_end))
+        pos = prose_end if code_end is None else code_end
+    return spans
+
+
+def may_contain_links(markdown: str) -> bool:
+    """Cheap prefilter: pages without any ``.md`` link can skip the regex."""
+    return ".md" in markdown and ("](" in markdown or "]:" in markdown or "<" in markdown)
+
+
+def markdown_digest(markdown: str) -> bytes:
+    """Return a digest identifying ``markdown`` (stable across processes, unlike ``hash``)."""
+    return hashlib.blake2b(markdown.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+
+class LinkRewriter:
+    """Rewrites prefixed links of a page using a frozen ``src -> URL`` page map.
+
+    ``link_map`` maps the ``/``-separated source path of every page to the URL
+    it is published under.  Markdown links to known pages are left as they
+    are: MkDocs resolves them by source path to the page's cleaned URL (and
+    validates their anchors).  Raw HTML ``href`` attributes are never seen by
+    MkDocs, so they get the target's URL relative to the page's URL.  Links to
+    unknown targets only get their file name cleaned.  The rewriter holds no
+    reference to the plugin and can be shipped to worker processes.
+    """
+
+    def __init__(
+        self, pattern: Pattern[str], stripper: PrefixStripper, link_map: dict[str, str]
+    ) -> None:
+        """Create a rewriter for the compiled link ``pattern``."""
+        self.pattern = pattern
+        self.stripper = stripper
+        self.link_map = link_map
+
+    def rewrite(self, markdown: str, page_src: Optional[str]) -> tuple[str, list[tuple[str, str]]]:
+        """Rewrite the links of a page; return the markdown and the ``(old, new)`` link pairs.
+
+        ``page_src`` is the ``/``-separated source path of the page, if known.
+        """
+        # Links are relative to the page's source directory.
+        src_dir = posixpath.dirname(page_src) if page_src is not None else ""
+        page_url = self.link_map.get(page_src, "") if page_src is not None else ""
+        rewrites: list[tuple[str, str]] = []
+
+        def replace_link(match: re.Match[str]) -> str:
+            target = match.lastindex or 0
+            link_path = match.group(target)
+            if "://" in link_path:
+                return match.group(0)  # absolute URL to another site
+
+            # Split path and anchor
+            if "#" in link_path:
+                path_part, anchor = link_path.split("#", 1)
+                anchor = f"#{anchor}"
+            else:
+                path_part = link_path
+                anchor = ""
+
+            known = self.resolve(path_part, src_dir)
+            if known is None:
+                new_path = self._clean_filename(path_part)
+            elif match.lastgroup != "href":
+                return match.group(0)  # MkDocs resolves it to the cleaned URL
+            elif path_part.startswith("/"):
+                new_path = f"/{self.link_map[known]}"
+            else:
+                new_path = get_relative_url(self.link_map[known], page_url)
+
+            if new_path == path_part:
+                return match.group(0)
+            rewrites.append((path_part, new_path))
+
+            # Only the target changes; the rest of the token is kept verbatim.
+            text = match.string
+            start, end = match.span(target)
+            return f"{text[match.start() : start]}{new_path}{anchor}{text[end : match.end()]}"
+
+        if "`" not in markdown and "~~~" not in markdown:
+            return self.pattern.sub(replace_link, markdown), rewrites
+
+        # Only prose is tokenized; code samples are copied through untouched.
+        pieces = []
+        last = 0
+        for start, end in prose_spans(markdown):
+            for match in self.pattern.finditer(markdown, start, end):
+                pieces.append(markdown[last : match.start()])
+                pieces.append(replace_link(match))
+                last = match.end()
+        pieces.append(markdown[last:])
+        return "".join(pieces), rewrites
+
+    def resolve(self, link: str, src_dir: str) -> Optional[str]:
+        """Return the source path of the known page ``link`` points at, else ``None``.
+
+        Like MkDocs, the link is URL-decoded first (``010--my%20page.md``).
+        """
+        link = unquote(link)
+        if link.startswith("/"):
+            target = posixpath.normpath(link)[1:]
+        elif not link.startswith(".") and "/." not in link:
+            target = f"{src_dir}/{link}" if src_dir else link
+        else:
+            target = posixpath.normpath(posixpath.join(src_dir, link))
+        return target if target in self.link_map else None
+
+    def _clean_filename(self, link: str) -> str:
+        """Strip the prefix from the file name of a link to an unknown target."""
+        filename = Path(link).name
+        new_filename = self.stripper.clean_component(filename)
+        if new_filename == filename:
+            return link
+
+        parent = Path(link).parent
+        if parent == Path("."):
+            return new_filename
+        return str(parent / new_filename)
+
+
+# Rewriter of the current worker process, installed once by ``init_worker``.
+_worker_rewriter: Optional[LinkRewriter] = None
+
+
+def init_worker(rewriter: LinkRewriter) -> None:
+    """Install ``rewriter`` in a worker process (ships the link map once per worker)."""
+    global _worker_rewriter  # noqa: PLW0603
+    _worker_rewriter = rewriter
+
+
+def rewrite_pages_chunk(
+    chunk: list[tuple[str, str]],
+) -> list[tuple[str, bytes, Optional[str], int]]:
+    """Read and rewrite a chunk of ``(page_src, abs_src_path)`` pages in a worker process.
+
+    Returns ``(page_src, digest, rewritten, links)`` for every readable page
+    that may contain links, where ``digest`` identifies the markdown MkDocs
+    will pass to ``on_page_markdown`` (the source without its front matter)
+    and ``rewritten`` is ``None`` when no link changed.
+    """
+    rewriter = _worker_rewriter
+    if rewriter is None:
+        raise RuntimeError("init_worker() must run before rewrite_pages_chunk()")
+
+    from mkdocs.utils import meta  # only needed in worker processes
+
+    results = []
+    for page_src, abs_src_path in chunk:
+        try:
+            with open(abs_src_path, encoding="utf-8-sig", errors="strict") as f:
+                markdown, _ = meta.get_data(f.read())
+        except (OSError, ValueError):
+            continue  # MkDocs reports unreadable pages itself
+
+        if not may_contain_links(markdown):
+            continue  # on_page_markdown skips these without a lookup
+
+        new_markdown, rewrites = rewriter.rewrite(markdown, page_src)
+        rewritten = new_markdown if rewrites else None
+        results.append((page_src, markdown_digest(markdown), rewritten, len(rewrites)))
+    return results
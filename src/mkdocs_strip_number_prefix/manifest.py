@@ -0,0 +1,64 @@
+# this_file: more/mkdocs-plugins/vexy-mkdocs-strip-number-prefix/src/mkdocs_strip_number_prefix/manifest.py  # noqa: E501
+"""Machine-readable manifest of the transformed pages, for downstream tools."""
+
+import json
+import logging
+import os
+from collections.abc import Iterable, Iterator
+from typing import Any, Optional
+
+logger = logging.getLogger(f"mkdocs.plugins.{__name__}")
+
+
+def nav_titles(nav: Any) -> dict[str, str]:
+    """Return the navigation title of every page in ``nav``, by ``/``-separated source path."""
+    titles = {}
+    stack = list(getattr(nav, "items", None) or [])
+    while stack:
+        item = stack.pop()
+        src_path = getattr(getattr(item, "file", None), "src_path", None)
+        title = getattr(item, "title", None)
+        if isinstance(src_path, str) and title:
+            titles[src_path.replace(os.sep, "/")] = title
+        stack.extend(getattr(item, "children", None) or [])
+    return titles
+
+
+def manifest_records(
+    pages: Iterable[Any], clean_paths: dict[str, str], titles: dict[str, str]
+) -> Iterator[dict[str, Optional[str]]]:
+    """Yield one record per page file: source, clean path, destination, URL and nav title.
+
+    ``clean_paths`` maps the ``/``-separated source path of every transformed
+    page to its clean path; other pages keep their source path.
+    """
+    for file in pages:
+        src_path = file.src_path.replace(os.sep, "/")
+        yield {
+            "src_path": src_path,
+            "clean_path": clean_paths.get(src_path, src_path),
+            "dest_path": file.dest_path.replace(os.sep, "/"),
+            "url": file.url,
+            "title": titles.get(src_path),
+        }
+
+
+def write_manifest(path: str, records: Iterable[dict[str, Optional[str]]]) -> int:
+    """Write ``records`` to ``path`` as JSON Lines; return how many were written.
+
+    Records are streamed one line at a time, so the manifest of a large site
+    is never held in memory as a whole.
+    """
+    count = 0
+    try:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")))
+                f.write("\n")
+                count += 1
+    except OSError as e:
+        logger.warning(f"StripNumberPrefix: Could not write manifest '{path}': {e}")
+    return count
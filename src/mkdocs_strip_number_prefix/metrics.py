@@ -0,0 +1,122 @@
+# this_file: more/mkdocs-plugins/vexy-mkdocs-strip-number-prefix/src/mkdocs_strip_number_prefix/metrics.py  # noqa: E501
+"""Per-build counters and hook timings of the plugin."""
+
+import functools
+import json
+import logging
+import os
+import time
+from typing import Any, Callable, TypeVar
+
+logger = logging.getLogger(f"mkdocs.plugins.{__name__}")
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class BuildMetrics:
+    """Counters and hook timings collected during one build.
+
+    A fresh instance is created in ``on_config`` so the numbers always
+    describe a single build (including each ``mkdocs serve`` rebuild).
+    """
+
+    def __init__(self) -> None:
+        """Start with every counter at zero."""
+        self.files_scanned = 0
+        self.files_recomputed = 0
+        self.files_transformed = 0
+        self.collisions = 0
+        self.component_cache_hits = 0
+        self.component_cache_misses = 0
+        self.path_cache_hits = 0
+        self.path_cache_misses = 0
+        self.link_cache_hits = 0
+        self.link_cache_misses = 0
+        self.pages_scanned = 0
+        self.pages_skipped = 0
+        self.links_rewritten = 0
+        self.nav_titles_changed = 0
+        self.assets_relocated = 0
+        self.assets_copied = 0
+        self.assets_linked = 0
+        self.assets_skipped = 0
+        self.site_files_fixed = 0
+        self.site_urls_fixed = 0
+        self.redirects_written = 0
+        self.hook_seconds: dict[str, float] = {}
+
+    def add_time(self, hook: str, seconds: float) -> None:
+        """Add ``seconds`` to the time spent in ``hook``."""
+        self.hook_seconds[hook] = self.hook_seconds.get(hook, 0.0) + seconds
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics as a JSON-serializable dict."""
+        return {
+            "files_scanned": self.files_scanned,
+            "files_recomputed": self.files_recomputed,
+            "files_transformed": self.files_transformed,
+            "collisions": self.collisions,
+            "components_cleaned": self.component_cache_misses,
+            "component_cache_hits": self.component_cache_hits,
+            "path_cache_hits": self.path_cache_hits,
+            "path_cache_misses": self.path_cache_misses,
+            "link_cache_hits": self.link_cache_hits,
+            "link_cache_misses": self.link_cache_misses,
+            "pages_scanned": self.pages_scanned,
+            "pages_skipped": self.pages_skipped,
+            "links_rewritten": self.links_rewritten,
+            "nav_titles_changed": self.nav_titles_changed,
+            "assets_relocated": self.assets_relocated,
+            "assets_copied": self.assets_copied,
+            "assets_linked": self.assets_linked,
+            "assets_skipped": self.assets_skipped,
+            "site_files_fixed": self.site_files_fixed,
+            "site_urls_fixed": self.site_urls_fixed,
+            "redirects_written": self.redirects_written,
+            "hook_seconds": dict(self.hook_seconds),
+        }
+
+    def summary(self) -> str:
+        """Return a one-line human readable summary."""
+        timings = ", ".join(
+            f"{hook} {seconds * 1000:.1f} ms" for hook, seconds in self.hook_seconds.items()
+        )
+        return (
+            f"{self.files_transformed}/{self.files_scanned} files transformed "
+            f"({self.files_recomputed} recomputed), "
+            f"{self.component_cache_misses} components cleaned "
+            f"({self.component_cache_hits} cache hits), "
+            f"{self.links_rewritten} links rewritten in {self.pages_scanned} pages "
+            f"({self.pages_skipped} skipped, {self.link_cache_hits} from cache), "
+            f"{self.nav_titles_changed} nav titles changed, "
+            f"{self.assets_relocated} assets relocated ({self.assets_copied} copied, "
+            f"{self.assets_linked} linked, {self.assets_skipped} unchanged), "
+            f"{self.site_urls_fixed} URLs fixed in {self.site_files_fixed} built files, "
+            f"{self.redirects_written} redirect files written; "
+            f"{timings or 'no hooks timed'}"
+        )
+
+    def write(self, path: str) -> None:
+        """Write the metrics to ``path`` as JSON."""
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(self.as_dict(), f, indent=2)
+        except OSError as e:
+            logger.warning(f"StripNumberPrefix: Could not write metrics '{path}': {e}")
+
+
+def timed(hook: F) -> F:
+    """Record the wall time of a plugin ``hook`` in the plugin's ``metrics``."""
+
+    @functools.wraps(hook)
+    def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            return hook(self, *args, **kwargs)
+        finally:
+            self.metrics.add_time(hook.__name__, time.perf_counter() - start)
+
+    return wrapper  # type: ignore[return-value]
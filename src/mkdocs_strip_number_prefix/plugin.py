@@ -1,22 +1,89 @@
 # this_file: more/mkdocs-plugins/vexy-mkdocs-strip-number-prefix/src/mkdocs_strip_number_prefix/plugin.py  # noqa: E501
 """Plugin to strip numeric prefixes from page URLs while keeping them in source files."""
 
+from __future__ import annotations
+
+import json
 import logging
+import os
 import re
-from collections import defaultdict
-from pathlib import Path
+import time
+from collections.abc import Callable
+from functools import partial
 from re import Pattern
-from typing import Optional
+from typing import TYPE_CHECKING, Any, Optional, TypeVar
+from urllib.parse import quote
 
 from mkdocs.config import config_options
-from mkdocs.config.defaults import MkDocsConfig
 from mkdocs.exceptions import PluginError
 from mkdocs.plugins import BasePlugin
-from mkdocs.structure.files import File, Files
-from mkdocs.structure.nav import Navigation
-from mkdocs.structure.pages import Page
 
-logger = logging.getLogger(__name__)
+from mkdocs_strip_number_prefix.collisions import CollisionReport
+from mkdocs_strip_number_prefix.index import PathIndex
+from mkdocs_strip_number_prefix.links import (
+    LINK_PATTERN,
+    LinkRewriter,
+    init_worker,
+    markdown_digest,
+    may_contain_links,
+    rewrite_pages_chunk,
+)
+from mkdocs_strip_number_prefix.metrics import BuildMetrics, timed
+from mkdocs_strip_number_prefix.stripper import PrefixStripper, clean_file_chunk, compile_patterns
+from mkdocs_strip_number_prefix.transforms import Transformation, TransformTable
+
+# Only needed for type hints; the process pool, caches, HTML rewriter, site
+# fixer, redirects and manifest are imported by the hooks that use them, so
+# loading the plugin stays cheap for builds that do not enable them.
+if TYPE_CHECKING:
+    from mkdocs.config.defaults import MkDocsConfig
+    from mkdocs.structure.files import File, Files
+    from mkdocs.structure.nav import Navigation
+    from mkdocs.structure.pages import Page
+
+    from mkdocs_strip_number_prefix.cache import LinkCache, PathCache
+    from mkdocs_strip_number_prefix.html_links import HtmlLinkRewriter
+
+# MkDocs only shows records logged under its own ``mkdocs.*`` namespace.
+logger = logging.getLogger(f"mkdocs.plugins.{__name__}")
+
+# Below this many files to clean, starting a worker pool costs more than it saves.
+PARALLEL_MIN_FILES = 2000
+
+# ``strip_links`` value that rewrites the rendered HTML instead of the markdown.
+HTML_LINKS = "html"
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def _map_in_pool(
+    func: Callable[[list[T]], list[R]],
+    items: list[T],
+    workers: int,
+    initializer: Optional[Callable[..., object]] = None,
+    initargs: tuple[Any, ...] = (),
+) -> tuple[list[R], int]:
+    """Run ``func`` over chunks of ``items`` in a pool of ``workers`` processes.
+
+    Returns the results of every chunk, flattened in the order of ``items``,
+    and the number of chunks.  Chunks are contiguous, so related items (sibling
+    pages and their shared parent components) stay in the same worker, and
+    there are about four per worker to balance the load.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    size = -(-len(items) // (workers * 4))
+    chunks = [items[i : i + size] for i in range(0, len(items), size)]
+    if initializer is None:
+        executor = ProcessPoolExecutor(max_workers=workers)
+    else:
+        executor = ProcessPoolExecutor(
+            max_workers=workers, initializer=initializer, initargs=initargs
+        )
+    with executor:
+        results = [result for chunk in executor.map(func, chunks) for result in chunk]
+    return results, len(chunks)
 
 
 class StripNumberPrefixPlugin(BasePlugin):  # type: ignore[no-untyped-call,type-arg]
@@ -30,146 +97,458 @@ class StripNumberPrefixPlugin(BasePlugin):  # type: ignore[no-untyped-call,type-
 
     config_scheme = (
         ("pattern", config_options.Type(str, default=r"^\d+--")),
+        ("patterns", config_options.ListOfItems(config_options.Type(str), default=[])),
         ("verbose", config_options.Type(bool, default=False)),
         ("strict", config_options.Type(bool, default=True)),
-        ("strip_links", config_options.Type(bool, default=False)),
+        ("strip_links", config_options.Type((bool, str), default=False)),
         ("strip_nav_titles", config_options.Type(bool, default=True)),
         ("dry_run", config_options.Type(bool, default=False)),
+        ("cache", config_options.Type(bool, default=False)),
+        ("cache_dir", config_options.Type(str, default=".cache/strip-number-prefix")),
+        ("link_cache_size", config_options.Type(int, default=4096)),
+        ("metrics", config_options.Type(bool, default=False)),
+        ("workers", config_options.Type(int, default=0)),
+        ("metrics_file", config_options.Type(str, default="")),
+        ("fix_site", config_options.Type(bool, default=False)),
+        ("redirects", config_options.Type(list, default=[])),
+        ("manifest_file", config_options.Type(str, default="")),
+        ("strip_assets", config_options.Type(bool, default=False)),
+        ("asset_copy", config_options.Type(str, default="copy")),
     )
 
     def __init__(self) -> None:
         """Initialize the plugin."""
         self.prefix_pattern: Optional[Pattern[str]] = None
-        self.processed_files: dict[str, str] = {}
-        self.collisions: dict[str, list[str]] = defaultdict(list)
-
+        self.stripper: Optional[PrefixStripper] = None
+        self.link_pattern: Optional[Pattern[str]] = None
+        self.link_rewriter: Optional[LinkRewriter] = None
+        self.link_map: dict[str, str] = {}
+        self.asset_map: dict[str, tuple[str, str]] = {}
+        self.html_rewriter: Optional[HtmlLinkRewriter] = None
+        self._prerendered: dict[str, tuple[bytes, Optional[str], int]] = {}
+        self.collisions = CollisionReport()
+        self.path_cache: Optional[PathCache] = None
+        self.link_cache: Optional[LinkCache] = None
+        self.path_index = PathIndex(os.sep)
+        self.command: Optional[str] = None
+        self.metrics = BuildMetrics()
+        self.metrics_file: Optional[str] = None
+        self.manifest_file: Optional[str] = None
+        self.pages: dict[str, File] = {}
+        self.nav: Optional[Navigation] = None
+
+        # Index kept between builds so ``mkdocs serve`` rebuilds only recompute
+        # the files that were added, removed or renamed since the last build.
+        self._signature: Optional[str] = None
+        self.transforms = TransformTable()
+
+    @property
+    def processed_files(self) -> dict[str, str]:
+        """Map the ``src_path`` of every page transformed by the last build to its clean path."""
+        return self.transforms.processed_files()
+
+    @property
+    def url_map(self) -> dict[str, tuple[str, str]]:
+        """Map the ``/``-separated source of every transformed page to ``(old URL, new URL)``."""
+        return self.transforms.url_map()
+
+    def on_startup(self, *, command: str, dirty: bool) -> None:  # noqa: ARG002
+        """Remember the MkDocs command.
+
+        Defining this hook also tells MkDocs to keep the same plugin instance
+        alive across ``mkdocs serve`` rebuilds, which the incremental index relies on.
+        """
+        self.command = command
+
+    @timed
     def on_config(self, config: MkDocsConfig) -> MkDocsConfig:
         """Initialize the regex pattern from config."""
+        self.metrics = BuildMetrics()
+        # Several conventions are combined into one alternation, so each
+        # component still costs a single match attempt.
+        patterns = self.config["patterns"] or [self.config["pattern"]]
         try:
-            self.prefix_pattern = re.compile(self.config["pattern"])
+            self.prefix_pattern = compile_patterns(patterns)
+            self.stripper = PrefixStripper(self.prefix_pattern)
+            self.link_pattern = re.compile(LINK_PATTERN)
+            self.link_rewriter = LinkRewriter(self.link_pattern, self.stripper, self.link_map)
             if self.config["verbose"]:
-                logger.info(f"StripNumberPrefix: Using pattern '{self.config['pattern']}'")
+                logger.info(f"StripNumberPrefix: Using pattern '{self.prefix_pattern.pattern}'")
         except re.error as e:
-            raise PluginError(f"Invalid regex pattern '{self.config['pattern']}': {e}") from e
+            raise PluginError(f"Invalid regex pattern '{e.pattern!s}': {e}") from e
+
+        if self.config["strip_links"] not in (True, False, HTML_LINKS):
+            raise PluginError(
+                f"Invalid strip_links value '{self.config['strip_links']}': "
+                f"expected true, false or '{HTML_LINKS}'"
+            )
+
+        redirects = self.config["redirects"]
+        if redirects:
+            from mkdocs_strip_number_prefix.redirects import REDIRECT_FORMATS
+
+            unknown = [f for f in redirects if f not in REDIRECT_FORMATS]
+            if unknown:
+                raise PluginError(
+                    f"Invalid redirects format '{unknown[0]}': "
+                    f"expected one of {', '.join(REDIRECT_FORMATS)}"
+                )
+
+        asset_copy = self.config["asset_copy"]
+        if asset_copy != "copy":
+            from mkdocs_strip_number_prefix.assets import COPY_STRATEGIES
+
+            if asset_copy not in COPY_STRATEGIES:
+                raise PluginError(
+                    f"Invalid asset_copy strategy '{asset_copy}': "
+                    f"expected one of {', '.join(COPY_STRATEGIES)}"
+                )
+
+        metrics_file = self.config["metrics_file"]
+        self.metrics_file = self._resolve_path(config, metrics_file) if metrics_file else None
+        manifest_file = self.config["manifest_file"]
+        self.manifest_file = self._resolve_path(config, manifest_file) if manifest_file else None
+
+        # Everything that influences the cleaned paths must be part of the signature.
+        signature = json.dumps([self.prefix_pattern.pattern, config.get("use_directory_urls")])
+        if signature != self._signature:
+            self._signature = signature
+            self._reset_index()
+
+            if self.config["cache"]:
+                from mkdocs_strip_number_prefix.cache import PathCache
+
+                cache_dir = self._resolve_path(config, self.config["cache_dir"])
+                self.path_cache = PathCache(cache_dir, signature)
+                self.path_cache.load()
+
+        # The link cache lives as long as the index, so ``mkdocs serve`` reloads
+        # reuse the pages rewritten by earlier builds.  A one-shot build can
+        # only reuse pages through the persistent cache.
+        link_cache_size = self.config["link_cache_size"]
+        reusable = self.command == "serve" or self.config["cache"]
+        if self.config["strip_links"] is not True or link_cache_size <= 0 or not reusable:
+            self.link_cache = None
+        elif self.link_cache is None or self.link_cache.maxsize != link_cache_size:
+            from mkdocs_strip_number_prefix.cache import LinkCache
+
+            link_cache_dir: Optional[str] = None
+            if self.config["cache"]:
+                link_cache_dir = self._resolve_path(config, self.config["cache_dir"])
+            self.link_cache = LinkCache(link_cache_size, signature, link_cache_dir)
+            self.link_cache.load()
 
         return config
 
-    def on_files(self, files: Files, config: MkDocsConfig) -> Files:  # noqa: PLR0912, ARG002
-        """Process files to strip numeric prefixes from paths and URLs."""
-        if not self.prefix_pattern:
-            return files
-
-        # First pass: collect all transformations
-        transformations: list[tuple[File, str]] = []
+    @staticmethod
+    def _resolve_path(config: MkDocsConfig, path: str) -> str:
+        """Resolve ``path`` relative to the directory of ``mkdocs.yml``."""
+        if os.path.isabs(path):
+            return path
+        config_file = config.get("config_file_path")
+        base_dir = os.path.dirname(config_file) if config_file else os.getcwd()
+        return os.path.join(base_dir, path)
+
+    def _reset_index(self) -> None:
+        """Forget everything computed by previous builds."""
+        self.transforms = TransformTable()
+        self.path_index = PathIndex(os.sep)
+        self.collisions = CollisionReport()
+        self.path_cache = None
+        self.link_cache = None
+
+    def _clean_file_paths(self, file: File) -> tuple[str, str, str]:
+        """Return the cleaned ``(virtual src path, dest_path, url)`` of ``file``."""
+        # Build *clean* path parts (without prefixes) for URL / dest_path generation.
+        # We intentionally DO NOT change ``file.src_path`` because that path must
+        # remain a valid path on disk for MkDocs to read the source markdown file.
+        # Changing it would break the `abs_src_path` property and ultimately raise
+        # ``FileNotFoundError`` during the build phase.  Instead, we derive the
+        # *virtual* cleaned path that will be exposed to the final site.
+        entry = self.stripper.clean_file_paths(file.src_path, file.dest_path, file.url, os.sep)
+
+        if self.config["verbose"] and entry[0] != file.src_path:
+            logger.info("StripNumberPrefix: virtual clean path %s -> %s", file.src_path, entry[0])
+
+        return entry
+
+    def _clean_in_pool(self, new: list[tuple[str, File]]) -> dict[str, tuple[str, str, str]]:
+        """Clean the uncached ``new`` files in a process pool when ``workers`` allows it.
+
+        Returns the entries by ``src_path``; an empty dict means the files are
+        cleaned sequentially while they are merged into the index.
+        """
+        workers = self.config["workers"]
+        stripper = self.stripper
+        if workers < 2 or stripper is None:
+            return {}
+
+        cache = self.path_cache
+        todo = [
+            (src_path, file.dest_path, file.url)
+            for src_path, file in new
+            if cache is None or src_path not in cache.entries
+        ]
+        if len(todo) < PARALLEL_MIN_FILES:
+            return {}
+
+        # Each worker keeps its component cache warm across a chunk of siblings.
+        clean = partial(clean_file_chunk, stripper, sep=os.sep)
+        entries, chunks = _map_in_pool(clean, todo, workers)
+
+        if self.config["verbose"]:
+            logger.info(
+                f"StripNumberPrefix: Cleaned {len(todo)} files in {chunks} chunks "
+                f"on {workers} workers"
+            )
+        return {item[0]: entry for item, entry in zip(todo, entries)}
+
+    def _update_collision(self, virtual_path: str, sources: list[str]) -> bool:
+        """Record or clear the collision on ``virtual_path``; return whether there is one."""
+        # Files without a prefix keep their path and are not considered claimants.
+        owners = [src_path for src_path in sources if src_path != virtual_path]
+        return self.collisions.record(virtual_path, owners)
+
+    def _release(self, src_path: str) -> None:
+        """Drop ``src_path`` from the index, updating the collision index in place."""
+        virtual_path = self.transforms.pop(src_path).clean_path
+        sources = self.path_index.remove(src_path)
+        if virtual_path != src_path:
+            self._update_collision(virtual_path, sources)
+
+    def _update_index(self, docs: dict[str, File]) -> set[str]:
+        """Bring the index in line with ``docs``, touching only the changed entries.
+
+        Returns the clean paths whose collisions were reported along the way.
+        """
+        removed = [src_path for src_path in self.transforms if src_path not in docs]
+        for src_path in removed:
+            self._release(src_path)
+
+        cache = self.path_cache
+        transforms = self.transforms
+        new = [(src_path, file) for src_path, file in docs.items() if src_path not in transforms]
+        precomputed = self._clean_in_pool(new)
+
+        added = 0
+        reported = set()
+        for src_path, file in new:
+            entry = precomputed.get(src_path)
+            fresh = entry is not None
+            if entry is None and cache is not None:
+                entry = cache.get(src_path)
+            if entry is None:
+                entry = self._clean_file_paths(file)
+                fresh = True
+
+            if cache is not None:
+                if fresh:
+                    cache.put(src_path, *entry)
+                    self.metrics.path_cache_misses += 1
+                else:
+                    self.metrics.path_cache_hits += 1
 
-        for file in files:
-            if not file.is_documentation_page():
-                continue
+            self.transforms[src_path] = Transformation(*entry)
+            sources = self.path_index.add(src_path, entry[0])
+            added += 1
 
-            # Build *clean* path parts (without prefixes) for URL / dest_path generation.
-            # We intentionally DO NOT change ``file.src_path`` because that path must
-            # remain a valid path on disk for MkDocs to read the source markdown file.
-            # Changing it would break the `abs_src_path` property and ultimately raise
-            # ``FileNotFoundError`` during the build phase.  Instead, we derive the
-            # *virtual* cleaned path that will be exposed to the final site and store
-            # the required information so we can later update ``dest_path`` and
-            # ``url``.
+            # Escalate as soon as a second file claims the same clean path, so
+            # strict builds fail without scanning the rest of the tree.
+            if entry[0] != src_path and self._update_collision(entry[0], sources):
+                self._report_collision(entry[0])
+                reported.add(entry[0])
 
-            src_parts = Path(file.src_path).parts
+        if self.config["verbose"] and self.command == "serve":
+            logger.info(f"StripNumberPrefix: Incremental update: {added} added, {len(removed)} removed")
 
-            clean_parts: list[str] = []
-            for part in src_parts:
-                clean_parts.append(self.prefix_pattern.sub("", part) if self.prefix_pattern.match(part) else part)
+        self.metrics.files_recomputed += added
 
-            cleaned_virtual_src = str(Path(*clean_parts))
+        return reported
 
-            # Only act when something actually changes (avoid needless work).
-            if cleaned_virtual_src != file.src_path:
-                transformations.append((file, cleaned_virtual_src))
+    def _report_collision(self, virtual_path: str) -> None:
+        """Fail (strict mode) or warn about the collision on ``virtual_path``."""
+        msg = self.collisions.message(virtual_path)
+        if self.config["strict"]:
+            raise PluginError(f"StripNumberPrefix: {msg}")
+        logger.warning(f"StripNumberPrefix: {msg}")
 
-                if self.config["verbose"]:
-                    logger.info(
-                        "StripNumberPrefix: virtual clean path %s -> %s", file.src_path, cleaned_virtual_src
-                    )
+    @timed
+    def on_files(self, files: Files, config: MkDocsConfig) -> Files:  # noqa: ARG002
+        """Process files to strip numeric prefixes from paths and URLs."""
+        if not self.prefix_pattern:
+            return files
 
         # ------------------------------------------------------------------
         # Collision detection: two different *source* files mapping to the
         # same *clean* (virtual) path would override each other in the final
-        # site.  We use the cleaned virtual path as the key and store the
-        # original ``src_path`` values for reporting.
+        # site.  New collisions are reported while the index is updated;
+        # collisions left over from the previous build are reported again
+        # here (only their files are unchanged, so they were not re-added).
         # ------------------------------------------------------------------
+        docs = {file.src_path: file for file in files if file.is_documentation_page()}
+        known = set(self.collisions)
+        reported = self._update_index(docs)
+
+        for virtual_path in list(self.collisions):
+            if virtual_path in known and virtual_path not in reported:
+                self._report_collision(virtual_path)
+
+        transformed = self._apply_transforms(docs)
 
-        dest_counts: dict[str, list[str]] = defaultdict(list)
-        for file_obj, new_virtual_path in transformations:
-            dest_counts[new_virtual_path].append(file_obj.src_path)
+        cache = self.path_cache
+        if cache is not None and not self.config["dry_run"]:
+            cache.save()
+            if self.config["verbose"]:
+                logger.info(f"StripNumberPrefix: Path cache {cache.hits} hits, {cache.misses} misses")
+
+        self.asset_map = {}
+        if self.config["strip_assets"]:
+            self._relocate_assets([file for file in files if not file.is_documentation_page()])
+
+        self.link_rewriter.link_map = self.link_map
+        if self.config["strip_links"] == HTML_LINKS and (transformed or self.asset_map):
+            from mkdocs_strip_number_prefix.html_links import HtmlLinkRewriter
 
-        # Report collisions
-        has_collision = False
-        for dest, sources in dest_counts.items():
-            if len(sources) > 1:
-                has_collision = True
-                self.collisions[dest] = sources
-                msg = f"Multiple files would map to '{dest}': {', '.join(sources)}"
+            # Raw ``<img src>`` and download links follow relocated assets too.
+            self.html_rewriter = HtmlLinkRewriter({**self.url_map, **self.asset_map})
+        else:
+            self.html_rewriter = None
+        if self.link_cache is not None:
+            # Rewritten pages are only valid for the link map they were made with.
+            generation = markdown_digest(json.dumps(list(self.link_map.items()))).hex()
+            self.link_cache.set_generation(generation)
+        self._prerendered = {}
+        self._prerender_links(docs)
+
+        self.pages = docs
+        self.nav = None
+        self.metrics.files_scanned = len(docs)
+        self.metrics.files_transformed = transformed
+        self.metrics.collisions = len(self.collisions)
+        return files
 
+    def _apply_transforms(self, docs: dict[str, File]) -> int:
+        """Give the pages their cleaned paths; return how many were transformed.
+
+        Collision files are skipped in non-strict mode.  ``link_map`` maps
+        every page's ``/``-separated source path to the URL it is published
+        under, so links resolve with one lookup.
+        """
+        self.link_map = {}
+        transformed = 0
+        to_posix = os.sep != "/"
+        for src_path, file_obj in docs.items():
+            record = self.transforms[src_path]
+            record.old_url = None
+            posix_src = src_path.replace(os.sep, "/") if to_posix else src_path
+            new_virtual_path = record.clean_path
+            if new_virtual_path == src_path or new_virtual_path in self.collisions:
+                self.link_map[posix_src] = file_obj.url
+                continue
+
+            # If dry-run mode is enabled, only log what would be done
+            if self.config["dry_run"]:
+                logger.info(
+                    f"DRY RUN: Would transform {file_obj.src_path} -> "
+                    f"dest_path: {file_obj.dest_path} (would become cleaned), "
+                    f"url: {file_obj.url} (would become cleaned)"
+                )
+                self.link_map[posix_src] = file_obj.url
+                continue
+
+            # The record now also serves as the redirect/URL map entry.
+            record.old_url = file_obj.url
+            file_obj.dest_path = record.dest_path
+            file_obj.url = self.link_map[posix_src] = record.url
+            transformed += 1
+
+        return transformed
+
+    def _relocate_assets(self, assets: list[File]) -> None:
+        """Publish static files under the cleaned form of their directory.
+
+        Only directories are cleaned (file names are kept), so assets land next
+        to the pages of the same folder.  The cleaned form of each directory is
+        computed once and shared by all the files in it.
+        """
+        clean_dir = self.stripper.clean_output_path
+        dir_map: dict[str, str] = {}
+        moves = []
+        claims: dict[str, list[str]] = {}
+        for file_obj in assets:
+            directory, name = os.path.split(file_obj.dest_path)
+            new_dir = dir_map.get(directory)
+            if new_dir is None:
+                new_dir = dir_map[directory] = clean_dir(directory, os.sep)
+            if new_dir == directory:
+                continue
+            dest_path = os.path.join(new_dir, name)
+            moves.append((file_obj, dest_path))
+            claims.setdefault(dest_path, []).append(file_obj.src_path)
+
+        # Two prefixed folders may clean to the same one; such assets stay put.
+        collisions = CollisionReport()
+        for dest_path, sources in claims.items():
+            if collisions.record(dest_path, sources):
+                msg = collisions.message(dest_path)
                 if self.config["strict"]:
                     raise PluginError(f"StripNumberPrefix: {msg}")
-                else:
-                    logger.warning(f"StripNumberPrefix: {msg}")
+                logger.warning(f"StripNumberPrefix: {msg}")
 
-        # Apply transformations only if no collisions, or in non-strict mode skip collision files
-        if has_collision and self.config["strict"]:
-            # In strict mode, we already raised an error, so this won't be reached
-            pass
+        copy_assets = self.config["asset_copy"] != "copy"
+        for file_obj, dest_path in moves:
+            if dest_path in collisions:
+                continue
+            if self.config["dry_run"]:
+                logger.info(f"DRY RUN: Would move asset {file_obj.src_path} -> {dest_path}")
+                continue
+            old_url = file_obj.url
+            new_url = quote(dest_path.replace(os.sep, "/"))
+            file_obj.dest_path = dest_path
+            file_obj.url = new_url
+            self.asset_map[file_obj.src_path.replace(os.sep, "/")] = (old_url, new_url)
+            if copy_assets:
+                # MkDocs calls ``copy_file`` on each file, so an instance attribute
+                # overrides the method for the relocated assets only.
+                copy_asset = partial(self._copy_asset, file_obj)
+                file_obj.copy_file = copy_asset  # type: ignore[method-assign]
+
+        self.metrics.assets_relocated = len(self.asset_map)
+        if self.config["verbose"]:
+            logger.info(
+                f"StripNumberPrefix: Relocated {len(self.asset_map)} assets "
+                f"from {sum(1 for d, c in dir_map.items() if d != c)} prefixed directories"
+            )
+
+    def _copy_asset(self, file_obj: File, dirty: bool = False) -> None:
+        """Place a relocated asset in the site with the ``asset_copy`` strategy.
+
+        Replaces ``File.copy_file`` of the assets moved by ``_relocate_assets``.
+        """
+        if file_obj.abs_src_path is None:
+            type(file_obj).copy_file(file_obj, dirty)  # content set by another plugin
+            return
+
+        from mkdocs_strip_number_prefix.assets import place_file
+        from mkdocs_strip_number_prefix.site_links import SITE_SUFFIXES
+
+        strategy = self.config["asset_copy"]
+        # ``fix_site`` may rewrite these files, which must never reach ``docs/``.
+        rewritable = self.config["fix_site"] and file_obj.dest_path.endswith(SITE_SUFFIXES)
+        if strategy == "hardlink" and rewritable:
+            strategy = "skip"
+        action = place_file(file_obj.abs_src_path, file_obj.abs_dest_path, strategy)
+        if action == "skipped":
+            self.metrics.assets_skipped += 1
+        elif action == "copied":
+            self.metrics.assets_copied += 1
         else:
-            # Apply transformations, but skip collision files in non-strict mode
-            for file_obj, new_virtual_path in transformations:
-                # In non-strict mode, skip files that would cause collisions
-                if has_collision and new_virtual_path in self.collisions:
-                    continue
-
-                # If dry-run mode is enabled, only log what would be done
-                if self.config["dry_run"]:
-                    logger.info(
-                        f"DRY RUN: Would transform {file_obj.src_path} -> "
-                        f"dest_path: {file_obj.dest_path} (would become cleaned), "
-                        f"url: {file_obj.url} (would become cleaned)"
-                    )
-                    continue
-                # ------------------------------------------------------------------
-                # ``dest_path`` and ``url`` should present the cleaned structure to
-                # the outside world.  We build new versions by applying the prefix
-                # removal to every path component while preserving the file
-                # extension (if any) and the trailing slash semantics used by
-                # MkDocs (``use_directory_urls``).
-                # ------------------------------------------------------------------
-
-                # Helper for stripping a single component (keeps file extension).
-                def _clean_component(component: str) -> str:
-                    if self.prefix_pattern.match(component):
-                        # Split filename and extension (if there is one)
-                        p = Path(component)
-                        if p.suffix:
-                            cleaned = self.prefix_pattern.sub("", p.stem) + p.suffix
-                        else:
-                            cleaned = self.prefix_pattern.sub("", component)
-                        return cleaned
-                    return component
-
-                # Build cleaned dest_path
-                dest_parts = [_clean_component(part) for part in Path(file_obj.dest_path).parts]
-                file_obj.dest_path = str(Path(*dest_parts))
-
-                # Build cleaned url (keep trailing slash if present in original)
-                url_parts = [_clean_component(part) for part in Path(file_obj.url).parts]
-                file_obj.url = "/".join(url_parts) + ("/" if file_obj.url.endswith("/") else "")
-
-                # Store mapping for link rewriting if needed later
-                self.processed_files[file_obj.src_path] = new_virtual_path
-
-        return files
+            self.metrics.assets_linked += 1
 
+    @timed
     def on_nav(self, nav: Navigation, config: MkDocsConfig, files: Files) -> Navigation:  # noqa: ARG002
         """Strip numeric prefixes from navigation titles."""
+        self.nav = nav  # final titles go into the manifest
         if not self.config["strip_nav_titles"] or not self.prefix_pattern:
             return nav
 
@@ -177,86 +556,224 @@ class StripNumberPrefixPlugin(BasePlugin):  # type: ignore[no-untyped-call,type-
             logger.info("DRY RUN: Navigation title processing would be performed but is skipped in dry-run mode")
             return nav
 
-        def clean_navigation_titles(nav_items: list) -> None:
-            """Recursively clean titles in navigation items."""
-            for item in nav_items:
-                if hasattr(item, "title") and item.title:
-                    original_title = item.title
-
-                    # Strip the numeric prefix from the title
-                    # Handle both file format (010--title) and navigation format (010 title)
-                    nav_pattern = re.compile(r"^\d+\s+")
-                    if self.prefix_pattern.match(original_title) or nav_pattern.match(original_title):
-                        # Use the navigation pattern if the original pattern doesn't match
-                        if nav_pattern.match(original_title):
-                            cleaned_title = nav_pattern.sub("", original_title).strip()
-                        else:
-                            cleaned_title = self.prefix_pattern.sub("", original_title)
-                            # Convert dashes to spaces and clean up formatting
-                            cleaned_title = cleaned_title.replace("--", "").replace("-", " ").strip()
-
-                        # Capitalize appropriately
-                        if cleaned_title:
-                            item.title = cleaned_title
-
-                            if self.config["verbose"]:
-                                logger.info(
-                                    f"StripNumberPrefix: Navigation title updated: {original_title} -> {cleaned_title}"
-                                )
-
-                # Recursively process children (for sections)
-                if hasattr(item, "children") and item.children:
-                    clean_navigation_titles(item.children)
-
-        # Process all navigation items
-        clean_navigation_titles(nav.items)
+        # Walk the navigation tree depth-first with an explicit stack so very
+        # deep trees cannot hit the recursion limit.
+        clean_title = self.stripper.clean_title
+        verbose = self.config["verbose"]
+        stack = list(reversed(nav.items))
+        while stack:
+            item = stack.pop()
+            original_title = getattr(item, "title", None)
+            if original_title:
+                cleaned_title = clean_title(original_title)
+                if cleaned_title != original_title:
+                    item.title = cleaned_title
+                    self.metrics.nav_titles_changed += 1
+                    if verbose:
+                        logger.info(
+                            f"StripNumberPrefix: Navigation title updated: {original_title} -> {cleaned_title}"
+                        )
+
+            # Process children (for sections) in their original order
+            children = getattr(item, "children", None)
+            if children:
+                stack.extend(reversed(children))
 
         return nav
 
+    @timed
     def on_page_markdown(
         self, markdown: str, page: Page, config: MkDocsConfig, files: Files  # noqa: ARG002
     ) -> str:
         """Optionally rewrite internal links to remove prefixes."""
-        if not self.config["strip_links"] or not self.prefix_pattern:
+        if self.config["strip_links"] is not True or not self.prefix_pattern:
             return markdown
 
         if self.config["dry_run"]:
             logger.info("DRY RUN: Link rewriting would be performed but is skipped in dry-run mode")
             return markdown
 
-        # Pattern to match markdown links
-        link_pattern = re.compile(r"\[([^\]]+)\]\(([^)]+\.md(?:#[^)]*)?)\)")
+        metrics = self.metrics
+        metrics.pages_scanned += 1
 
-        def replace_link(match: re.Match[str]) -> str:
-            link_text = match.group(1)
-            link_path = match.group(2)
+        # Cheap prefilter: pages without any inline ``.md`` link skip the regex.
+        if not may_contain_links(markdown):
+            metrics.pages_skipped += 1
+            return markdown
 
-            # Split path and anchor
-            if "#" in link_path:
-                path_part, anchor = link_path.split("#", 1)
-                anchor = f"#{anchor}"
+        page_src = getattr(getattr(page, "file", None), "src_path", None)
+        page_src = page_src.replace(os.sep, "/") if isinstance(page_src, str) else None
+
+        # Pages rewritten by the parallel pre-pass or an earlier build are a
+        # lookup, as long as their markdown is unchanged.
+        digest = markdown_digest(markdown)
+        prerendered = self._prerendered.pop(page_src, None) if page_src is not None else None
+        link_cache = self.link_cache
+        key = f"{page_src or ''}\n{digest.hex()}"
+        cached: Optional[tuple[Optional[str], int]] = None
+        from_prepass = prerendered is not None and prerendered[0] == digest
+        if from_prepass:
+            cached = prerendered[1:]  # type: ignore[index]
+        elif link_cache is not None:
+            cached = link_cache.get(key)
+            if cached is None:
+                metrics.link_cache_misses += 1
             else:
-                path_part = link_path
-                anchor = ""
-
-            # Check if this is a processed file
-            filename = Path(path_part).name
-            if self.prefix_pattern and self.prefix_pattern.match(filename):
-                # Strip prefix
-                new_filename = self.prefix_pattern.sub("", filename) if self.prefix_pattern else filename
-                parent = Path(path_part).parent
-
-                if parent == Path("."):
-                    new_path = new_filename
-                else:
-                    new_path = str(parent / new_filename)
+                metrics.link_cache_hits += 1
 
-                if self.config["verbose"]:
+        if cached is None:
+            new_markdown, rewrites = self.link_rewriter.rewrite(markdown, page_src)
+            if self.config["verbose"]:
+                for path_part, new_path in rewrites:
                     logger.info(f"StripNumberPrefix: Rewriting link {path_part} -> {new_path}")
+            cached = (new_markdown if rewrites else None, len(rewrites))
+            if link_cache is not None:
+                link_cache.put(key, *cached)
+        elif from_prepass and link_cache is not None:
+            link_cache.put(key, *cached)
+
+        rewritten, links = cached
+        metrics.links_rewritten += links
+        return markdown if rewritten is None else rewritten
+
+    def _prerender_links(self, docs: dict[str, File]) -> None:
+        """Rewrite the links of every page up front in a process pool.
+
+        Only runs when ``workers`` allows it and the site is large enough; the
+        results are picked up by ``on_page_markdown``.
+        """
+        workers = self.config["workers"]
+        if workers < 2 or self.config["strip_links"] is not True or self.config["dry_run"]:
+            return
+
+        todo = [
+            (src_path.replace(os.sep, "/"), file.abs_src_path)
+            for src_path, file in docs.items()
+            if file.abs_src_path is not None
+        ]
+        if len(todo) < PARALLEL_MIN_FILES:
+            return
+
+        results, _ = _map_in_pool(
+            rewrite_pages_chunk, todo, workers, init_worker, (self.link_rewriter,)
+        )
+        self._prerendered = {
+            page_src: (digest, rewritten, links) for page_src, digest, rewritten, links in results
+        }
+
+        if self.config["verbose"]:
+            logger.info(f"StripNumberPrefix: Pre-rewrote links of {len(self._prerendered)} pages")
+
+    @timed
+    def on_page_content(
+        self, html: str, page: Page, config: MkDocsConfig, files: Files  # noqa: ARG002
+    ) -> str:
+        """Rewrite prefixed URLs in the rendered HTML when ``strip_links`` is ``html``.
 
-                return f"[{link_text}]({new_path}{anchor})"
-
-            return match.group(0)
+        This also catches links produced by other plugins and macros, which
+        never show up in the markdown.
+        """
+        if self.config["strip_links"] != HTML_LINKS or not self.prefix_pattern:
+            return html
 
-        # Replace all links
-        return link_pattern.sub(replace_link, markdown)
+        if self.config["dry_run"]:
+            logger.info("DRY RUN: HTML link rewriting would be performed but is skipped in dry-run mode")
+            return html
+
+        metrics = self.metrics
+        metrics.pages_scanned += 1
+        rewriter = self.html_rewriter
+        if rewriter is None or not rewriter.may_contain_links(html):
+            metrics.pages_skipped += 1
+            return html
+
+        file = getattr(page, "file", None)
+        page_src = getattr(file, "src_path", None)
+        page_src = page_src.replace(os.sep, "/") if isinstance(page_src, str) else None
+        page_url = getattr(file, "url", None) or ""
+
+        new_html, rewrites = rewriter.rewrite(html, page_src, page_url)
+        if self.config["verbose"]:
+            for old_url, new_url in rewrites:
+                logger.info(f"StripNumberPrefix: Rewriting URL {old_url} -> {new_url}")
+        metrics.links_rewritten += len(rewrites)
+        return new_html
+
+    def on_post_build(self, config: MkDocsConfig) -> None:
+        """Fix leftover URLs, write redirects and the manifest, then report the build metrics once."""
+        metrics = self.metrics
+        transformed = metrics.files_transformed
+        if self.config["fix_site"] and transformed and not self.config["dry_run"]:
+            start = time.perf_counter()
+            self._fix_site(config["site_dir"], config.get("site_url") or "")
+            metrics.add_time("fix_site", time.perf_counter() - start)
+
+        # Written after the fixer, which would otherwise rewrite the old URLs they list.
+        formats = self.config["redirects"]
+        if formats and transformed and not self.config["dry_run"]:
+            from urllib.parse import urlsplit
+
+            from mkdocs_strip_number_prefix.redirects import render_redirects, write_redirects
+
+            base = urlsplit(config.get("site_url") or "").path.rstrip("/") + "/"
+            outputs = render_redirects(self.url_map, formats, base)
+            metrics.redirects_written = write_redirects(config["site_dir"], outputs)
+            if self.config["verbose"]:
+                logger.info(f"StripNumberPrefix: Wrote {metrics.redirects_written} redirect files")
+
+        if self.stripper is not None:
+            hits, misses = self.stripper.cache_stats()
+            metrics.component_cache_hits, metrics.component_cache_misses = hits, misses
+
+        if self.config["verbose"] or self.config["metrics"]:
+            logger.info(f"StripNumberPrefix: {metrics.summary()}")
+        if self.manifest_file:
+            from mkdocs_strip_number_prefix.manifest import (
+                manifest_records,
+                nav_titles,
+                write_manifest,
+            )
+
+            titles = nav_titles(self.nav) if self.nav is not None else {}
+            records = manifest_records(self.pages.values(), self.transforms.clean_paths(), titles)
+            count = write_manifest(self.manifest_file, records)
+            if self.config["verbose"]:
+                logger.info(f"StripNumberPrefix: Wrote {count} pages to manifest '{self.manifest_file}'")
+
+        if self.metrics_file:
+            metrics.write(self.metrics_file)
+
+        if self.link_cache is not None and not self.config["dry_run"]:
+            self.link_cache.save()
+
+    def _fix_site(self, site_dir: str, site_url: str) -> None:
+        """Rewrite old prefixed URLs left in the built files by other plugins.
+
+        Files are processed in a process pool when ``workers`` allows it and
+        the site is large enough.
+        """
+        from mkdocs_strip_number_prefix.site_links import (
+            SiteLinkFixer,
+            fix_files_chunk,
+            iter_site_files,
+        )
+        from mkdocs_strip_number_prefix.site_links import (
+            init_worker as init_fixer_worker,
+        )
+
+        url_map = {record.old_url: record.url for _, record in self.transforms.applied()}
+        fixer = SiteLinkFixer(url_map, site_dir, site_url)  # type: ignore[arg-type]
+        paths = list(iter_site_files(site_dir))
+        workers = self.config["workers"]
+        if workers >= 2 and len(paths) >= PARALLEL_MIN_FILES:
+            counts, _ = _map_in_pool(fix_files_chunk, paths, workers, init_fixer_worker, (fixer,))
+        else:
+            counts = [fixer.fix_file(path) for path in paths]
+
+        self.metrics.site_files_fixed = sum(1 for count in counts if count)
+        self.metrics.site_urls_fixed = sum(counts)
+        if self.config["verbose"]:
+            logger.info(
+                f"StripNumberPrefix: Fixed {self.metrics.site_urls_fixed} URLs in "
+                f"{self.metrics.site_files_fixed} of {len(paths)} built files"
+            )
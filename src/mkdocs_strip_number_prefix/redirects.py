@@ -0,0 +1,84 @@
+# this_file: more/mkdocs-plugins/vexy-mkdocs-strip-number-prefix/src/mkdocs_strip_number_prefix/redirects.py  # noqa: E501
+"""Redirects from the old prefixed URLs of transformed pages to their clean URLs."""
+
+import json
+import logging
+import os
+from html import escape
+
+from mkdocs.utils import get_relative_url
+
+logger = logging.getLogger(f"mkdocs.plugins.{__name__}")
+
+# Supported ``redirects`` formats.
+REDIRECT_FORMATS = ("html", "json", "nginx")
+
+# Files written next to the built site for the ``json`` and ``nginx`` formats.
+JSON_FILE = "redirects.json"
+NGINX_FILE = "redirects.map"
+
+STUB_TEMPLATE = """<!doctype html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>Redirecting...</title>
+<link rel="canonical" href="{url}">
+<meta name="robots" content="noindex">
+<script>var anchor=window.location.hash.substr(1);location.href="{url}"+(anchor?"#"+anchor:"")</script>
+<meta http-equiv="refresh" content="0; url={url}">
+</head>
+<body>Redirecting to <a href="{url}">{url}</a>...</body>
+</html>
+"""
+
+
+def stub_path(url: str) -> str:
+    """Return the site-relative file a page published under ``url`` is served from."""
+    return f"{url}index.html" if url == "" or url.endswith("/") else url
+
+
+def render_redirects(
+    url_map: dict[str, tuple[str, str]], formats: list[str], base: str = "/"
+) -> dict[str, str]:
+    """Return the content of every redirect file, by site-relative path.
+
+    ``url_map`` maps source paths to ``(old URL, new URL)`` pairs and ``base``
+    is the path the site is served under.  Stubs use relative URLs so they
+    work wherever the site is deployed; the map files use absolute paths.
+    """
+    pairs = sorted(url_map.values())
+    outputs = {}
+    if "html" in formats:
+        for old, new in pairs:
+            url = escape(get_relative_url(new, old) or "./")
+            outputs[stub_path(old)] = STUB_TEMPLATE.format(url=url)
+    if "json" in formats:
+        redirects = {f"{base}{old}": f"{base}{new}" for old, new in pairs}
+        outputs[JSON_FILE] = json.dumps(redirects, indent=2) + "\n"
+    if "nginx" in formats:
+        # Entries for a ``map $uri $redirect { include redirects.map; }`` block.
+        outputs[NGINX_FILE] = "".join(f"{base}{old} {base}{new};\n" for old, new in pairs)
+    return outputs
+
+
+def write_redirects(site_dir: str, outputs: dict[str, str]) -> int:
+    """Write the rendered redirect files under ``site_dir``; return how many were written.
+
+    Stubs never replace a file the build produced, e.g. a page that now
+    lives under an old URL.
+    """
+    written = 0
+    for rel_path, content in outputs.items():
+        path = os.path.join(site_dir, *rel_path.split("/"))
+        if rel_path.endswith(".html") and os.path.exists(path):
+            logger.warning(f"StripNumberPrefix: Not replacing '{rel_path}' with a redirect stub")
+            continue
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(content)
+        except OSError as e:
+            logger.warning(f"StripNumberPrefix: Could not write redirect '{path}': {e}")
+            continue
+        written += 1
+    return written
@@ -0,0 +1,175 @@
+# this_file: more/mkdocs-plugins/vexy-mkdocs-strip-number-prefix/src/mkdocs_strip_number_prefix/site_links.py  # noqa: E501
+"""Post-build rewriting of leftover prefixed URLs across the built site."""
+
+import mmap
+import os
+import posixpath
+import re
+from collections.abc import Iterator
+from typing import Optional, Union
+from urllib.parse import urlsplit
+
+# Output files that can carry page URLs (pages, search index, sitemap, feeds).
+SITE_SUFFIXES = (".html", ".htm", ".json", ".xml")
+
+# Pages, whose relative URLs are relative to the page itself; relative URLs in
+# the other files (e.g. search index locations) are relative to the site root.
+PAGE_SUFFIXES = (".html", ".htm")
+
+# How a token is anchored: after ``//`` (``https://host/...``), after ``/``
+# (root-relative) or neither (relative to its page).
+HOST_RELATIVE, ROOT_RELATIVE, RELATIVE = range(3)
+
+# Path-like tokens ending like a page URL (``dir/`` or ``page.html``) and
+# followed by a URL delimiter.  Every old URL is such a token, a suffix of one
+# (behind ``https://host/`` or ``/`` and the base path), one without its
+# ``index.html`` or, once resolved against the file's directory, a relative
+# one, so one linear scan finds all candidates.
+TOKEN_PATTERN = re.compile(
+    rb"(?<![\w.%~-])(?:[\w.%~-]+/)*[\w.%~-]+(?:/|\.html)(?=[#?\"'<>()\s\\]|$)"
+)
+
+
+def iter_site_files(site_dir: str) -> Iterator[str]:
+    """Yield the path of every output file under ``site_dir`` that can contain URLs."""
+    for root, _, names in os.walk(site_dir):
+        for name in names:
+            if name.endswith(SITE_SUFFIXES):
+                yield os.path.join(root, name)
+
+
+class SiteLinkFixer:
+    """Replaces old prefixed page URLs in built files using an ``old -> new`` URL map.
+
+    Only URLs of this site are rewritten: full URLs on the host of
+    ``site_url`` (``https://host/docs/010--guide/``) and root-relative ones
+    (``/docs/010--guide/``), both under its base path, and relative URLs,
+    which are resolved against the directory of their page under
+    ``site_dir`` first.  Links to other sites are left alone.
+    Files are memory-mapped and scanned in place; only files that contain an
+    old URL are read into memory and written back, through a temporary file
+    that replaces them.  Hardlinked files share their data with another path
+    (e.g. an asset in ``docs/``) and are never rewritten.  The fixer holds no
+    reference to the plugin and can be shipped to worker processes.
+    """
+
+    def __init__(self, url_map: dict[str, str], site_dir: str, site_url: str = "") -> None:
+        """Create a fixer for the site-root-relative ``url_map`` of the site in ``site_dir``."""
+        self.site_dir = site_dir
+        parts = urlsplit(site_url)
+        self.host = parts.netloc.lower().encode("utf-8")
+        # Base path without its leading ``/`` (``docs/``), as tokens start after it.
+        self.base_path = parts.path.strip("/").encode("utf-8")
+        if self.base_path:
+            self.base_path += b"/"
+        self.replacements = {
+            old.encode("utf-8"): new.encode("utf-8") for old, new in url_map.items() if old != new
+        }
+
+    def _base(self, path: str) -> bytes:
+        """Return the ``/``-separated directory relative URLs in the file at ``path`` start from."""
+        if not path.endswith(PAGE_SUFFIXES):
+            return b""
+        base = os.path.relpath(os.path.dirname(path), self.site_dir)
+        return b"" if base == os.curdir else base.replace(os.sep, "/").encode("utf-8")
+
+    def _lookup(self, token: bytes, base: bytes, kind: int) -> Optional[tuple[int, int, bytes]]:
+        """Return the span of the old URL in ``token`` and its new form, if it contains one."""
+        end = len(token) - 10 if token.endswith(b"/index.html") else len(token)
+        if kind == RELATIVE:
+            return self._lookup_relative(token[:end], base, end)
+        start = 0
+        if kind == HOST_RELATIVE:
+            start = token.find(b"/", 0, end) + 1
+            if not start or not self.host or token[: start - 1].lower() != self.host:
+                return None
+        if not token.startswith(self.base_path, start):
+            return None
+        start += len(self.base_path)
+        new = self.replacements.get(token[start:end])
+        return None if new is None else (start, end, new)
+
+    def _lookup_relative(
+        self, url: bytes, base: bytes, end: int
+    ) -> Optional[tuple[int, int, bytes]]:
+        """Resolve the relative ``url`` against ``base``; return its span and new relative form."""
+        resolved = posixpath.normpath(posixpath.join(base, url))
+        if resolved == b".." or resolved.startswith(b"../"):
+            return None
+        if url.endswith(b"/"):
+            resolved += b"/"
+        new = self.replacements.get(resolved)
+        if new is None:
+            return None
+        if base:
+            relative = posixpath.relpath(new.rstrip(b"/") or b".", base)
+            new = relative + b"/" if new.endswith(b"/") else relative
+        return 0, end, new
+
+    def _find(
+        self, data: Union[bytes, mmap.mmap], base: bytes
+    ) -> Iterator[tuple[re.Match[bytes], tuple[int, int, bytes]]]:
+        """Yield every token of ``data`` that contains an old URL, with its lookup result."""
+        for match in TOKEN_PATTERN.finditer(data):
+            start = match.start()
+            kind = RELATIVE
+            if start > 0 and data[start - 1 : start] == b"/":
+                kind = HOST_RELATIVE if data[start - 2 : start] == b"//" else ROOT_RELATIVE
+            found = self._lookup(match.group(0), base, kind)
+            if found is not None:
+                yield match, found
+
+    def fix_file(self, path: str) -> int:
+        """Rewrite the old URLs in the file at ``path``; return how many were replaced."""
+        base = self._base(path)
+        try:
+            with open(path, "rb") as f:
+                stat = os.fstat(f.fileno())
+                if stat.st_size == 0 or stat.st_nlink > 1:
+                    return 0
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    if next(self._find(mapped, base), None) is None:
+                        return 0
+                    data = mapped[:]
+        except OSError:
+            return 0
+
+        count = 0
+        parts = []
+        pos = 0
+        for match, (start, end, new) in self._find(data, base):
+            token = match.group(0)
+            parts += [data[pos : match.start()], token[:start], new, token[end:]]
+            pos = match.end()
+            count += 1
+        parts.append(data[pos:])
+        # Replacing the file (rather than writing into it) never reaches the
+        # data of other links to it.
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, "wb") as out:
+                out.write(b"".join(parts))
+            os.replace(temp_path, path)
+        except OSError:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        return count
+
+
+# Fixer of the current worker process, installed once by ``init_worker``.
+_worker_fixer: Optional[SiteLinkFixer] = None
+
+
+def init_worker(fixer: SiteLinkFixer) -> None:
+    """Install ``fixer`` in a worker process (ships the URL map once per worker)."""
+    global _worker_fixer  # noqa: PLW0603
+    _worker_fixer = fixer
+
+
+def fix_files_chunk(chunk: list[str]) -> list[int]:
+    """Fix a chunk of files in a worker process; return the replacements per file."""
+    fixer = _worker_fixer
+    if fixer is None:
+        raise RuntimeError("init_worker() must run before fix_files_chunk()")
+    return [fixer.fix_file(path) for path in chunk]
@@ -0,0 +1,183 @@
+# this_file: more/mkdocs-plugins/vexy-mkdocs-strip-number-prefix/src/mkdocs_strip_number_prefix/stripper.py  # noqa: E501
+"""Memoized engine that strips numeric prefixes from single path components."""
+
+import re
+from functools import lru_cache
+from pathlib import PurePath
+from re import Pattern
+from typing import Any, Callable, Optional
+
+# Upper bound on the number of distinct components remembered by each cache.
+COMPONENT_CACHE_SIZE = 65536
+
+# Navigation titles MkDocs derives from section names (``010 Guide``).
+NAV_TITLE_PATTERN = re.compile(r"^\d+\s+")
+
+# Built-in prefix conventions (``^\d+--``, ``^\d+_``, ``^\d{3}-``...) that a plain
+# string scanner strips without the regex engine: digits, then a separator.
+SIMPLE_PREFIX_PATTERN = re.compile(r"\^\\d(?:\+|\{(\d+)\})(--|-|_|\\\.)")
+
+ASCII_DIGITS = "0123456789"
+
+
+def simple_prefix_stripper(pattern: Pattern[str]) -> Optional[Callable[[str], str]]:
+    """Return a regex-free equivalent of ``pattern.sub("", text)``, if ``pattern`` allows one.
+
+    Only the built-in ``digits + separator`` conventions qualify; any other
+    pattern returns ``None`` and keeps using the regex engine.
+    """
+    spec = SIMPLE_PREFIX_PATTERN.fullmatch(pattern.pattern)
+    if spec is None or pattern.flags != re.UNICODE:
+        return None
+    width = int(spec.group(1)) if spec.group(1) else 0
+    separator = spec.group(2).replace("\\", "")
+
+    def strip(text: str) -> str:
+        if width:
+            if not text[:width].isdecimal() or len(text) < width:
+                return text
+            end = width
+        else:
+            rest = text.lstrip(ASCII_DIGITS)
+            end = len(text) - len(rest)
+            while end < len(text) and text[end].isdecimal():  # other Unicode digits, as ``\d``
+                end += 1
+            if not end:
+                return text
+        return text[end + len(separator) :] if text.startswith(separator, end) else text
+
+    return strip
+
+
+# Global inline flags (``(?i)``) that must become scoped when a pattern is combined.
+GLOBAL_FLAGS_PATTERN = re.compile(r"^\(\?([aiLmsux]+)\)")
+
+
+def compile_patterns(patterns: list[str]) -> Pattern[str]:
+    """Compile several prefix ``patterns`` into one alternation, matched in one attempt.
+
+    Every pattern is compiled on its own first, so a ``re.error`` names the
+    faulty one in its ``pattern`` attribute.  A single pattern is compiled
+    unchanged.  Combined patterns must not capture: duplicate group names
+    would break the alternation and numbered backreferences would shift, so
+    such a pattern is rejected with a ``re.error`` naming it.
+    """
+    compiled = [re.compile(pattern) for pattern in patterns]
+    if len(compiled) == 1:
+        return compiled[0]
+    for regex in compiled:
+        if regex.groups:
+            raise re.error(
+                "capturing groups cannot be combined with other patterns, use (?:...)",
+                pattern=regex.pattern,
+            )
+
+    parts = []
+    for pattern in patterns:
+        flags = GLOBAL_FLAGS_PATTERN.match(pattern)
+        if flags:
+            parts.append(f"(?{flags.group(1)}:{pattern[flags.end() :]})")
+        else:
+            parts.append(f"(?:{pattern})")
+    return re.compile("|".join(parts))
+
+
+class PrefixStripper:
+    """Strips the configured prefix from path components, remembering the results.
+
+    Pages in the same folder share their prefixed parent directories, so the
+    same handful of components (``010--guide``, ``020--api``) is cleaned over
+    and over for the virtual source path, ``dest_path``, ``url``, navigation
+    titles and links.  Every hook routes through one instance of this class so
+    that each unique component costs a single regex evaluation.
+    """
+
+    def __init__(self, pattern: Pattern[str], maxsize: int = COMPONENT_CACHE_SIZE) -> None:
+        """Create an engine for the compiled prefix ``pattern``."""
+        self.pattern = pattern
+        self.maxsize = maxsize
+        self.strip = simple_prefix_stripper(pattern) or self._strip_with_regex
+        self.clean_component = lru_cache(maxsize=maxsize)(self._clean_component)
+        self.clean_filename = lru_cache(maxsize=maxsize)(self._clean_filename)
+        self.clean_title = lru_cache(maxsize=maxsize)(self._clean_title)
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        """Pickle by pattern only; caches are rebuilt empty on the other side."""
+        return (self.__class__, (self.pattern, self.maxsize))
+
+    def _strip_with_regex(self, text: str) -> str:
+        """Strip the prefix from ``text`` with the regex engine."""
+        if self.pattern.match(text):
+            return self.pattern.sub("", text)
+        return text
+
+    def _clean_component(self, component: str) -> str:
+        """Strip the prefix from ``component`` as a whole."""
+        return self.strip(component)
+
+    def _clean_filename(self, component: str) -> str:
+        """Strip the prefix from ``component`` while keeping its file extension."""
+        stripped = self.strip(component)
+        if stripped == component:
+            return component
+
+        # Split filename and extension (if there is one)
+        p = PurePath(component)
+        if p.suffix:
+            return self.strip(p.stem) + p.suffix
+        return stripped
+
+    def _clean_title(self, title: str) -> str:
+        """Strip the prefix from a navigation ``title``; return it unchanged if nothing is left."""
+        # Handle both file format (010--title) and navigation format (010 title)
+        nav_match = NAV_TITLE_PATTERN.match(title)
+        if nav_match:
+            cleaned = title[nav_match.end() :].strip()
+        elif self.clean_component(title) != title:
+            cleaned = self.clean_component(title)
+            # Convert dashes to spaces and clean up formatting
+            cleaned = cleaned.replace("--", "").replace("-", " ").strip()
+        else:
+            return title
+        return cleaned or title
+
+    def clean_path(self, path: str, sep: str = "/") -> str:
+        """Strip the prefix from every ``sep``-separated component of ``path``."""
+        return sep.join([self.clean_component(part) for part in path.split(sep)])
+
+    def clean_output_path(self, path: str, sep: str = "/") -> str:
+        """Like :meth:`clean_path` but preserves file extensions (for ``dest_path``/``url``)."""
+        return sep.join([self.clean_filename(part) for part in path.split(sep)])
+
+    def clean_file_paths(
+        self, src_path: str, dest_path: str, url: str, sep: str
+    ) -> tuple[str, str, str]:
+        """Return the cleaned ``(virtual src path, dest_path, url)`` of a file.
+
+        ``src_path`` and ``dest_path`` use ``sep``; ``url`` always uses ``/``.
+        """
+        cleaned_virtual_src = self.clean_path(src_path, sep)
+
+        # Only act when something actually changes (avoid needless work).
+        if cleaned_virtual_src == src_path:
+            return cleaned_virtual_src, dest_path, url
+
+        # ``dest_path`` and ``url`` should present the cleaned structure to the
+        # outside world.  Every component is cleaned while preserving the file
+        # extension (if any); splitting the URL on ``/`` keeps the trailing slash
+        # semantics used by MkDocs (``use_directory_urls``).
+        dest_path = self.clean_output_path(dest_path, sep)
+        return cleaned_virtual_src, dest_path, self.clean_output_path(url)
+
+    def cache_stats(self) -> tuple[int, int]:
+        """Return the combined ``(hits, misses)`` of the component and title caches."""
+        caches = (self.clean_component, self.clean_filename, self.clean_title)
+        infos = [cache.cache_info() for cache in caches]
+        return sum(info.hits for info in infos), sum(info.misses for info in infos)
+
+
+def clean_file_chunk(
+    stripper: PrefixStripper, chunk: list[tuple[str, str, str]], sep: str
+) -> list[tuple[str, str, str]]:
+    """Clean a chunk of ``(src_path, dest_path, url)`` triples in a worker process."""
+    return [stripper.clean_file_paths(*item, sep) for item in chunk]
@@ -0,0 +1,58 @@
+# this_file: more/mkdocs-plugins/vexy-mkdocs-strip-number-prefix/src/mkdocs_strip_number_prefix/transforms.py  # noqa: E501
+"""Compact table of the cleaned paths of every documentation page."""
+
+import os
+from collections.abc import Iterator
+from typing import Optional
+
+
+class Transformation:
+    """Cleaned paths of one page and, once applied, the URL it replaced.
+
+    Records are slotted and reuse the strings produced by the stripper, so a
+    large site pays for one small object per page instead of a tuple per view.
+    """
+
+    __slots__ = ("clean_path", "dest_path", "old_url", "url")
+
+    def __init__(self, clean_path: str, dest_path: str, url: str) -> None:
+        """Create a record for the cleaned ``(virtual src path, dest_path, url)`` of a page."""
+        self.clean_path = clean_path
+        self.dest_path = dest_path
+        self.url = url
+        # URL MkDocs would have used, set while the record is applied to its
+        # file; ``None`` means the page keeps its paths in this build.
+        self.old_url: Optional[str] = None
+
+
+class TransformTable(dict[str, Transformation]):
+    """Maps each page's ``src_path`` to its :class:`Transformation`.
+
+    The table is kept between ``mkdocs serve`` rebuilds and is the single
+    source for collision bookkeeping, link and URL maps and reporting; the
+    per-build views below are derived from it on demand.
+    """
+
+    def applied(self) -> Iterator[tuple[str, Transformation]]:
+        """Yield ``(src_path, record)`` for every page transformed in this build."""
+        for src_path, record in self.items():
+            if record.old_url is not None:
+                yield src_path, record
+
+    def processed_files(self) -> dict[str, str]:
+        """Map the ``src_path`` of every transformed page to its clean path."""
+        return {src_path: record.clean_path for src_path, record in self.applied()}
+
+    def clean_paths(self) -> dict[str, str]:
+        """Map the ``/``-separated source path of every transformed page to its clean path."""
+        return {
+            src_path.replace(os.sep, "/"): record.clean_path.replace(os.sep, "/")
+            for src_path, record in self.applied()
+        }
+
+    def url_map(self) -> dict[str, tuple[str, str]]:
+        """Map the ``/``-separated source of every transformed page to ``(old URL, new URL)``."""
+        return {
+            src_path.replace(os.sep, "/"): (record.old_url, record.url)  # type: ignore[misc]
+            for src_path, record in self.applied()
+        }
@@ -0,0 +1,55 @@
+# this_file: more/mkdocs-plugins/vexy-mkdocs-strip-number-prefix/tests/test_assets.py
+"""Tests for placing relocated static files."""
+
+import os
+
+import pytest
+
+from mkdocs_strip_number_prefix.assets import is_unchanged, place_file
+
+
+@pytest.fixture
+def src(tmp_path):
+    """Create a source asset."""
+    path = tmp_path / "docs" / "image.png"
+    path.parent.mkdir()
+    path.write_bytes(b"\x89PNG data")
+    return path
+
+
+class TestPlaceFile:
+    """Test cases for place_file."""
+
+    def test_copy_keeps_mtime_and_skips_unchanged(self, src, tmp_path):
+        """Test that copies keep the mtime so the next build skips them."""
+        dest = tmp_path / "site" / "img" / "image.png"
+
+        assert place_file(str(src), str(dest), "skip") == "copied"
+        assert dest.read_bytes() == src.read_bytes()
+        assert is_unchanged(str(src), str(dest))
+        assert place_file(str(src), str(dest), "skip") == "skipped"
+
+    def test_changed_source_is_placed_again(self, src, tmp_path):
+        """Test that a different size or mtime replaces the destination."""
+        dest = tmp_path / "site" / "image.png"
+        place_file(str(src), str(dest), "skip")
+        src.write_bytes(b"\x89PNG other data")
+
+        assert place_file(str(src), str(dest), "skip") == "copied"
+        assert dest.read_bytes() == b"\x89PNG other data"
+
+    def test_hardlink(self, src, tmp_path):
+        """Test that hardlinked assets share the source's inode."""
+        dest = tmp_path / "site" / "image.png"
+
+        assert place_file(str(src), str(dest), "hardlink") == "linked"
+        assert os.path.samefile(src, dest)
+        assert place_file(str(src), str(dest), "hardlink") == "skipped"
+
+    def test_reflink_falls_back_to_copy(self, src, tmp_path):
+        """Test that reflinks either clone the file or fall back to a copy."""
+        dest = tmp_path / "site" / "image.png"
+
+        assert place_file(str(src), str(dest), "reflink") in ("reflinked", "copied")
+        assert dest.read_bytes() == src.read_bytes()
+        assert not os.path.samefile(src, dest)
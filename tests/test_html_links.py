@@ -0,0 +1,54 @@
+# this_file: more/mkdocs-plugins/vexy-mkdocs-strip-number-prefix/tests/test_html_links.py
+"""Tests for the rendered HTML link rewriter."""
+
+import pytest
+
+from mkdocs_strip_number_prefix.html_links import HtmlLinkRewriter
+
+
+@pytest.fixture
+def rewriter():
+    """Create a rewriter for a small tree of transformed pages."""
+    return HtmlLinkRewriter(
+        {
+            "010--guide/010--intro.md": ("010--guide/010--intro/", "guide/intro/"),
+            "010--guide/020--setup.md": ("010--guide/020--setup/", "guide/setup/"),
+        }
+    )
+
+
+class TestHtmlLinkRewriter:
+    """Test cases for HtmlLinkRewriter."""
+
+    def test_rewrite_attributes(self, rewriter):
+        """Test that old URLs and source paths in any tag are rewritten."""
+        html = (
+            '<a href="../020--setup/?q=1#x">a</a> '
+            "<a class='x' href='020--setup.md'>b</a> "
+            "<iframe src=/010--guide/020--setup/></iframe>"
+        )
+
+        result, rewrites = rewriter.rewrite(html, "010--guide/010--intro.md", "guide/intro/")
+
+        assert result == (
+            '<a href="../setup/?q=1#x">a</a> '
+            "<a class='x' href='../setup/'>b</a> "
+            "<iframe src=/guide/setup/></iframe>"
+        )
+        assert len(rewrites) == 3
+
+    def test_rewrite_keeps_other_values(self, rewriter):
+        """Test that unknown, external and fragment-only URLs are left alone."""
+        html = (
+            '<a href="#top">a</a> <a href="https://example.com/010--guide/020--setup/">b</a> '
+            '<img src="../030--missing/"> <a href="../../../010--guide/">c</a> '
+            "<code>href=\"../020--setup/\"</code>"
+        )
+
+        assert rewriter.rewrite(html, "010--guide/010--intro.md", "guide/intro/") == (html, [])
+
+    def test_rewrite_from_untransformed_page(self, rewriter):
+        """Test that pages outside the map resolve links from their own URL."""
+        result, _ = rewriter.rewrite('<a href="010--guide/020--setup/">s</a>', "index.md", "")
+
+        assert result == '<a href="guide/setup/">s</a>'
@@ -0,0 +1,91 @@
+# this_file: more/mkdocs-plugins/vexy-mkdocs-strip-number-prefix/tests/test_index.py
+"""Tests for the trie index of cleaned paths."""
+
+import pytest
+
+from mkdocs_strip_number_prefix.index import PathIndex
+
+
+class TestPathIndex:
+    """Test cases for PathIndex."""
+
+    @pytest.fixture
+    def index(self):
+        """Create an index with a small nested tree."""
+        index = PathIndex()
+        index.add("010--guide/010--install.md", "guide/install.md")
+        index.add("010--guide/020--setup.md", "guide/setup.md")
+        index.add("about.md", "about.md")
+        return index
+
+    def test_src_to_clean(self, index):
+        """Test resolving source files and directories to clean paths."""
+        assert index.clean("010--guide/020--setup.md") == "guide/setup.md"
+        assert index.clean("010--guide") == "guide"
+        assert index.clean("missing.md") is None
+        assert "010--guide/020--setup.md" in index
+        assert "010--guide" not in index
+        assert len(index) == 3
+
+    def test_clean_to_src(self, index):
+        """Test resolving clean paths back to their sources."""
+        assert index.sources("guide/setup.md") == ["010--guide/020--setup.md"]
+        assert index.sources("guide/missing.md") == []
+
+        assert index.add("020--guide/020--setup.md", "guide/setup.md") == [
+            "010--guide/020--setup.md",
+            "020--guide/020--setup.md",
+        ]
+
+    def test_remove_promotes_next_source(self, index):
+        """Test that removing the first claimant keeps the remaining ones."""
+        index.add("020--guide/020--setup.md", "guide/setup.md")
+        index.add("030--guide/020--setup.md", "guide/setup.md")
+
+        assert index.remove("010--guide/020--setup.md") == [
+            "020--guide/020--setup.md",
+            "030--guide/020--setup.md",
+        ]
+        assert index.remove("030--guide/020--setup.md") == ["020--guide/020--setup.md"]
+        assert index.remove("020--guide/020--setup.md") == []
+        assert index.sources("guide/setup.md") == []
+
+    def test_children(self, index):
+        """Test listing the entries of a directory."""
+        assert index.children() == {"010--guide": "guide", "about.md": "about.md"}
+        assert index.children("010--guide") == {
+            "010--install.md": "install.md",
+            "020--setup.md": "setup.md",
+        }
+        assert index.children("missing") == {}
+
+    def test_remove_prunes_empty_directories(self, index):
+        """Test that removing the last file of a directory drops the directory."""
+        index.remove("010--guide/010--install.md")
+        assert index.clean("010--guide") == "guide"
+
+        assert index.remove("010--guide/020--setup.md") == []
+        assert index.clean("010--guide") is None
+        assert index.children() == {"about.md": "about.md"}
+        assert len(index) == 1
+
+        with pytest.raises(KeyError):
+            index.remove("010--guide/020--setup.md")
+
+    def test_clean_link(self, index):
+        """Test rewriting relative links against the index."""
+        assert index.clean_link("010--guide", "020--setup.md") == "setup.md"
+        assert index.clean_link("010--guide", "../about.md") == "../about.md"
+        assert index.clean_link("", "010--guide/./010--install.md") == "guide/./install.md"
+        assert index.clean_link("010--guide", "/010--guide/020--setup.md") == "/guide/setup.md"
+        assert index.clean_link("", "../about.md") is None
+        assert index.clean_link("", "010--guide") is None
+        assert index.clean_link("", "missing.md") is None
+
+    def test_separator(self):
+        """Test indexing paths that use a platform separator."""
+        index = PathIndex("\\")
+        index.add("010--guide\\020--setup.md", "guide\\setup.md")
+
+        assert index.clean("010--guide\\020--setup.md") == "guide\\setup.md"
+        assert index.clean_link("010--guide", "020--setup.md") == "setup.md"
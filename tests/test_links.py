@@ -0,0 +1,185 @@
+# this_file: more/mkdocs-plugins/vexy-mkdocs-strip-number-prefix/tests/test_links.py
+"""Tests for the markdown link rewriter."""
+
+import pickle
+import re
+
+import pytest
+
+from mkdocs_strip_number_prefix import links
+from mkdocs_strip_number_prefix.links import (
+    LINK_PATTERN,
+    LinkRewriter,
+    init_worker,
+    markdown_digest,
+    prose_spans,
+    rewrite_pages_chunk,
+)
+from mkdocs_strip_number_prefix.stripper import PrefixStripper
+
+
+@pytest.fixture
+def rewriter():
+    """Create a rewriter for a small tree of pages."""
+    link_map = {
+        "010--guide/010--intro.md": "guide/intro/",
+        "010--guide/020--setup.md": "guide/setup/",
+        "about.md": "about/",
+        "010--guide/030--my page.md": "guide/my%20page/",
+    }
+    return LinkRewriter(re.compile(LINK_PATTERN), PrefixStripper(re.compile(r"^\d+--")), link_map)
+
+
+class TestLinkRewriter:
+    """Test cases for LinkRewriter."""
+
+    def test_rewrite_returns_rewritten_links(self, rewriter):
+        """Test that only links to unknown targets are changed, and reported once."""
+        markdown = "[Setup](020--setup.md#x) [About](../about.md) [Other](030--other.md)"
+
+        result, rewrites = rewriter.rewrite(markdown, "010--guide/010--intro.md")
+
+        assert result == "[Setup](020--setup.md#x) [About](../about.md) [Other](other.md)"
+        assert rewrites == [("030--other.md", "other.md")]
+
+    def test_rewrite_keeps_links_to_known_pages(self, rewriter):
+        """Test that links MkDocs resolves by source path are left for MkDocs."""
+        markdown = (
+            "[Setup](./020--setup.md) [Intro](../010--guide/010--intro.md#top) "
+            "[Root](/010--guide/020--setup.md)\n[about]: ../about.md\n"
+        )
+
+        assert rewriter.resolve("../010--guide/./020--setup.md", "010--guide") == (
+            "010--guide/020--setup.md"
+        )
+        assert rewriter.rewrite(markdown, "010--guide/010--intro.md") == (markdown, [])
+
+    def test_rewrite_keeps_encoded_links_to_known_pages(self, rewriter):
+        """Test that percent-encoded links are decoded before they are looked up."""
+        markdown = "[Mine](030--my%20page.md) [Other](030--other%20page.md)"
+
+        assert rewriter.resolve("030--my%20page.md", "010--guide") == "010--guide/030--my page.md"
+        assert rewriter.rewrite(markdown, "010--guide/010--intro.md")[0] == (
+            "[Mine](030--my%20page.md) [Other](other%20page.md)"
+        )
+
+    def test_rewrite_raw_html_to_urls(self, rewriter):
+        """Test that raw HTML links to known pages get the target's URL, relative to the page."""
+        markdown = (
+            '<a href="020--setup.md#h">Setup</a> <a href="../about.md">About</a> '
+            "<a href='/010--guide/020--setup.md'>Root</a>"
+        )
+
+        result, rewrites = rewriter.rewrite(markdown, "010--guide/010--intro.md")
+
+        assert result == (
+            '<a href="../setup/#h">Setup</a> <a href="../../about/">About</a> '
+            "<a href='/guide/setup/'>Root</a>"
+        )
+        assert rewrites == [
+            ("020--setup.md", "../setup/"),
+            ("../about.md", "../../about/"),
+            ("/010--guide/020--setup.md", "/guide/setup/"),
+        ]
+
+    def test_rewrite_all_link_forms(self, rewriter):
+        """Test that every link form is rewritten in one scan."""
+        markdown = (
+            '[Other](030--other.md "Title") [![Logo](010--logo.png)](030--other.md#top)\n'
+            "[other]: 030--other.md#install\n"
+            "   [about]: <../about.md>\n"
+            "Autolink <030--other.md> and <a class=\"x\" href='030--other.md#h'>raw</a>\n"
+        )
+
+        result, rewrites = rewriter.rewrite(markdown, "010--guide/010--intro.md")
+
+        assert result == (
+            '[Other](other.md "Title") [![Logo](010--logo.png)](other.md#top)\n'
+            "[other]: other.md#install\n"
+            "   [about]: <../about.md>\n"
+            "Autolink <other.md> and <a class=\"x\" href='other.md#h'>raw</a>\n"
+        )
+        assert len(rewrites) == 5
+
+    def test_rewrite_skips_external_urls(self, rewriter):
+        """Test that links to other sites are left alone."""
+        markdown = '[Ext](https://example.com/010--x.md) <a href="https://example.com/010--x.md">'
+
+        assert rewriter.rewrite(markdown, "010--guide/010--intro.md") == (markdown, [])
+
+    def test_rewrite_without_page(self, rewriter):
+        """Test that links resolve from the docs root when the page is unknown."""
+        markdown = "[Intro](010--guide/010--intro.md) [Other](010--guide/030--other.md)"
+
+        result, _ = rewriter.rewrite(markdown, None)
+
+        assert result == "[Intro](010--guide/010--intro.md) [Other](010--guide/other.md)"
+
+    def test_rewrite_skips_code(self, rewriter):
+        """Test that links inside fenced blocks and inline code are left alone."""
+        markdown = (
+            "[Other](030--other.md) and `[Code](030--other.md)`\n"
+            "```python\n"
+            'print("[Fenced](030--other.md)")\n'
+            "```\n"
+            "~~~~\n"
+            "~~~\n"
+            "[Still fenced](030--other.md)\n"
+            "~~~~\n"
+            "A lone ` backtick before [Other](030--other.md)"
+        )
+
+        result, rewrites = rewriter.rewrite(markdown, "010--guide/010--intro.md")
+
+        assert result == markdown.replace("[Other](030--other.md)", "[Other](other.md)")
+        assert rewrites == [("030--other.md", "other.md")] * 2
+
+    def test_prose_spans(self):
+        """Test splitting markdown into the ranges outside code."""
+        markdown = "a `b` c\n```\nd\n```\ne ``f ` g`` h\n~~~\nunclosed"
+
+        assert [markdown[start:end] for start, end in prose_spans(markdown)] == [
+            "a ",
+            " c\n",
+            "\ne ",
+            " h\n",
+        ]
+        assert prose_spans("no code") == [(0, 7)]
+        assert prose_spans("```not`a fence``` x") == [(17, 19)]
+
+    def test_pickle_round_trip(self, rewriter):
+        """Test that the rewriter can be shipped to worker processes."""
+        clone = pickle.loads(pickle.dumps(rewriter))
+
+        assert clone.link_map == rewriter.link_map
+        assert clone.rewrite("[Other](030--other.md)", "010--guide/010--intro.md")[0] == (
+            "[Other](other.md)"
+        )
+
+    def test_rewrite_pages_chunk(self, rewriter, tmp_path):
+        """Test reading and rewriting pages the way MkDocs will see them."""
+        page = tmp_path / "intro.md"
+        page.write_text("---\ntitle: Intro\n---\nSee [Other](030--other.md).\n", encoding="utf-8")
+        plain = tmp_path / "plain.md"
+        plain.write_text("No links.\n", encoding="utf-8")
+
+        init_worker(rewriter)
+        try:
+            results = rewrite_pages_chunk(
+                [
+                    ("010--guide/010--intro.md", str(page)),
+                    ("about.md", str(plain)),
+                    ("missing.md", str(tmp_path / "missing.md")),
+                ]
+            )
+        finally:
+            links._worker_rewriter = None
+
+        assert results == [
+            (
+                "010--guide/010--intro.md",
+                markdown_digest("See [Other](030--other.md).\n"),
+                "See [Other](other.md).\n",
+                1,
+            )
+        ]
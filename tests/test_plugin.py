@@ -1,6 +1,10 @@
 # this_file: more/mkdocs-plugins/vexy-mkdocs-strip-number-prefix/tests/test_plugin.py
 """Tests for vexy-mkdocs-strip-number-prefix plugin."""
 
+import json
+import os
+import subprocess
+import sys
 from unittest.mock import Mock, patch
 
 import pytest
@@ -13,6 +17,18 @@ from mkdocs.structure.pages import Page
 from mkdocs_strip_number_prefix.plugin import StripNumberPrefixPlugin
 
 
+def make_doc_file(src_path):
+    """Create a mock documentation page as MkDocs would with ``use_directory_urls``."""
+    stem = src_path[: -len(".md")]
+    file = Mock(spec=File)
+    file.is_documentation_page.return_value = True
+    file.src_path = src_path
+    file.dest_path = f"{stem}/index.html"
+    file.url = f"{stem}/"
+    file.src_uri = src_path
+    return file
+
+
 class TestStripNumberPrefixPlugin:
     """Test cases for StripNumberPrefixPlugin."""
 
@@ -28,6 +44,18 @@ class TestStripNumberPrefixPlugin:
             "strip_links": False,
             "strip_nav_titles": True,
             "dry_run": False,
+            "cache": False,
+            "cache_dir": ".cache/strip-number-prefix",
+            "link_cache_size": 4096,
+            "metrics": False,
+            "workers": 0,
+            "metrics_file": "",
+            "fix_site": False,
+            "redirects": [],
+            "manifest_file": "",
+            "strip_assets": False,
+            "asset_copy": "copy",
+            "patterns": [],
         }
         return plugin
 
@@ -145,11 +173,15 @@ class TestStripNumberPrefixPlugin:
         file1 = Mock(spec=File)
         file1.is_documentation_page.return_value = True
         file1.src_path = "010--intro.md"
+        file1.dest_path = "010--intro/index.html"
+        file1.url = "010--intro/"
         file1.src_uri = "010--intro.md"
 
         file2 = Mock(spec=File)
         file2.is_documentation_page.return_value = True
         file2.src_path = "020--intro.md"
+        file2.dest_path = "020--intro/index.html"
+        file2.url = "020--intro/"
         file2.src_uri = "020--intro.md"
 
         files = Files([file1, file2])
@@ -744,17 +776,18 @@ class TestStripNumberPrefixPlugin:
         site_dir = tmp_path / "site"
 
         # Create test files with internal links
+        # (Unindented: indented lines would be a code block, not links.)
         (docs_dir / "index.md").write_text("""# Welcome
-        See [Getting Started](010--getting-started.md) for setup.
-        Also check [Advanced Guide](020--advanced.md#configuration).
-        """)
+See [Getting Started](010--getting-started.md) for setup.
+Also check [Advanced Guide](020--advanced.md#configuration).
+""")
         (docs_dir / "010--getting-started.md").write_text("""# Getting Started
-        Back to [Home](index.md) or continue to [Advanced](020--advanced.md).
-        """)
+Back to [Home](index.md) or continue to [Advanced](020--advanced.md).
+""")
         (docs_dir / "020--advanced.md").write_text("""# Advanced Topics
-        ## Configuration
-        Advanced configuration details.
-        """)
+## Configuration
+Advanced configuration details.
+""")
 
         mkdocs_config = {
             'site_name': 'Full Options Test',
@@ -1097,17 +1130,18 @@ class TestStripNumberPrefixPlugin:
         site_dir = tmp_path / "site"
 
         # Create test files with internal links
+        # (Unindented: indented lines would be a code block, not links.)
         (docs_dir / "index.md").write_text("""# Welcome
-        See [Getting Started](010--getting-started.md) for setup.
-        Also check [Advanced Guide](020--advanced.md#configuration).
-        """)
+See [Getting Started](010--getting-started.md) for setup.
+Also check [Advanced Guide](020--advanced.md#configuration).
+""")
         (docs_dir / "010--getting-started.md").write_text("""# Getting Started
-        Back to [Home](index.md) or continue to [Advanced](020--advanced.md).
-        """)
+Back to [Home](index.md) or continue to [Advanced](020--advanced.md).
+""")
         (docs_dir / "020--advanced.md").write_text("""# Advanced Topics
-        ## Configuration
-        Advanced configuration details.
-        """)
+## Configuration
+Advanced configuration details.
+""")
 
         mkdocs_config = {
             'site_name': 'Full Options Test',
@@ -1328,17 +1362,18 @@ class TestStripNumberPrefixPlugin:
         site_dir = tmp_path / "site"
 
         # Create test files with internal links
+        # (Unindented: indented lines would be a code block, not links.)
         (docs_dir / "index.md").write_text("""# Welcome
-        See [Getting Started](010--getting-started.md) for setup.
-        Also check [Advanced Guide](020--advanced.md#configuration).
-        """)
+See [Getting Started](010--getting-started.md) for setup.
+Also check [Advanced Guide](020--advanced.md#configuration).
+""")
         (docs_dir / "010--getting-started.md").write_text("""# Getting Started
-        Back to [Home](index.md) or continue to [Advanced](020--advanced.md).
-        """)
+Back to [Home](index.md) or continue to [Advanced](020--advanced.md).
+""")
         (docs_dir / "020--advanced.md").write_text("""# Advanced Topics
-        ## Configuration
-        Advanced configuration details.
-        """)
+## Configuration
+Advanced configuration details.
+""")
 
         mkdocs_config = {
             'site_name': 'Full Options Test',
@@ -1444,4 +1479,738 @@ class TestStripNumberPrefixPlugin:
             assert result == markdown
 
             # Should log dry-run for links
-            assert any("DRY RUN" in str(call) for call in mock_logger.info.call_args_list)
\ No newline at end of file
+            assert any("DRY RUN" in str(call) for call in mock_logger.info.call_args_list)
+
+    def test_path_cache_warm_build(self, plugin, mkdocs_config, tmp_path):
+        """Test that a warm build reuses cached paths instead of recomputing them."""
+        plugin.config["cache"] = True
+        plugin.config["cache_dir"] = str(tmp_path / "cache")
+
+        plugin.on_config(mkdocs_config)
+        plugin.on_files(Files([make_doc_file("010--guide/020--setup.md")]), mkdocs_config)
+        assert (tmp_path / "cache" / "paths.json").exists()
+        assert plugin.path_cache.misses == 1
+
+        warm = StripNumberPrefixPlugin()
+        warm.config = dict(plugin.config)
+        warm.on_config(mkdocs_config)
+        warm_file = make_doc_file("010--guide/020--setup.md")
+        warm.on_files(Files([warm_file]), mkdocs_config)
+
+        assert warm.path_cache.hits == 1
+        assert warm.path_cache.misses == 0
+        assert warm_file.dest_path == "guide/setup/index.html"
+        assert warm_file.url == "guide/setup/"
+        assert warm.processed_files["010--guide/020--setup.md"] == "guide/setup.md"
+
+    def test_path_cache_invalidated_by_pattern_change(self, plugin, mkdocs_config, tmp_path):
+        """Test that changing the pattern discards previously cached paths."""
+        plugin.config["cache"] = True
+        plugin.config["cache_dir"] = str(tmp_path / "cache")
+        plugin.on_config(mkdocs_config)
+
+        mock_file = Mock(spec=File)
+        mock_file.is_documentation_page.return_value = True
+        mock_file.src_path = "010--intro.md"
+        mock_file.dest_path = "010--intro/index.html"
+        mock_file.url = "010--intro/"
+        mock_file.src_uri = "010--intro.md"
+        plugin.on_files(Files([mock_file]), mkdocs_config)
+
+        changed = StripNumberPrefixPlugin()
+        changed.config = dict(plugin.config, pattern=r"^\d{3}--")
+        changed.on_config(mkdocs_config)
+
+        assert changed.path_cache.entries == {}
+
+    def test_path_cache_invalidated_by_upgrade(self, plugin, mkdocs_config, tmp_path):
+        """Test that a cache written by another plugin release is discarded."""
+        plugin.config["cache"] = True
+        plugin.config["cache_dir"] = str(tmp_path / "cache")
+        plugin.on_config(mkdocs_config)
+        plugin.on_files(Files([make_doc_file("010--intro.md")]), mkdocs_config)
+
+        upgraded = StripNumberPrefixPlugin()
+        upgraded.config = dict(plugin.config)
+        with patch("mkdocs_strip_number_prefix.cache.version", return_value="999.0.0"):
+            upgraded.on_config(mkdocs_config)
+
+        assert plugin.path_cache.version != "0.0.0+unknown"
+        assert upgraded.path_cache.entries == {}
+
+    @pytest.mark.parametrize(
+        "entries", [None, [], {"010--intro.md": "intro.md"}, {"010--intro.md": ["a", "b"]}]
+    )
+    def test_path_cache_malformed_is_discarded(self, plugin, mkdocs_config, tmp_path, entries):
+        """Test that a cache of the wrong shape is treated as stale instead of failing the build."""
+        plugin.config["cache"] = True
+        plugin.config["cache_dir"] = str(tmp_path / "cache")
+        plugin.on_config(mkdocs_config)
+        plugin.on_files(Files([make_doc_file("010--intro.md")]), mkdocs_config)
+
+        cache_file = tmp_path / "cache" / "paths.json"
+        data = json.loads(cache_file.read_text(encoding="utf-8"))
+        data["entries"] = entries
+        cache_file.write_text(json.dumps(data if entries is not None else []), encoding="utf-8")
+
+        rebuilt = StripNumberPrefixPlugin()
+        rebuilt.config = dict(plugin.config)
+        rebuilt.on_config(mkdocs_config)
+        intro = make_doc_file("010--intro.md")
+        rebuilt.on_files(Files([intro]), mkdocs_config)
+
+        assert intro.url == "intro/"
+        assert rebuilt.path_cache.misses == 1
+        assert json.loads(cache_file.read_text(encoding="utf-8"))["entries"] == {
+            "010--intro.md": ["intro.md", "intro/index.html", "intro/"]
+        }
+
+    @pytest.mark.parametrize("entries", [{}, [["key", None]], [["key", 1, 1]]])
+    def test_link_cache_malformed_is_discarded(self, plugin, mkdocs_config, tmp_path, entries):
+        """Test that a link cache of the wrong shape is ignored."""
+        cache_dir = tmp_path / "cache"
+        cache_dir.mkdir()
+        plugin.config.update(strip_links=True, cache=True, cache_dir=str(cache_dir))
+        plugin.on_config(mkdocs_config)
+        cache = plugin.link_cache
+        data = {"version": cache.version, "signature": cache.signature, "entries": entries}
+        (cache_dir / "links.json").write_text(json.dumps(data), encoding="utf-8")
+
+        cache.load()
+
+        assert cache.entries == {}
+
+    def test_incremental_rebuild_only_processes_changes(self, plugin, mkdocs_config):
+        """Test that a rebuild on the same instance only recomputes added files."""
+        plugin.on_startup(command="serve", dirty=False)
+        plugin.on_config(mkdocs_config)
+
+        plugin.on_files(Files([make_doc_file("010--intro.md"), make_doc_file("020--setup.md")]), mkdocs_config)
+
+        plugin.on_config(mkdocs_config)
+        rebuilt = [make_doc_file("010--intro.md"), make_doc_file("030--deploy.md")]
+        with patch.object(plugin, "_clean_file_paths", wraps=plugin._clean_file_paths) as spy:
+            plugin.on_files(Files(rebuilt), mkdocs_config)
+
+        assert [call.args[0].src_path for call in spy.call_args_list] == ["030--deploy.md"]
+        assert rebuilt[0].url == "intro/"
+        assert rebuilt[1].url == "deploy/"
+        assert plugin.processed_files == {"010--intro.md": "intro.md", "030--deploy.md": "deploy.md"}
+
+    def test_incremental_rebuild_resolves_collision(self, plugin, mkdocs_config):
+        """Test that removing a colliding file clears the collision on rebuild."""
+        plugin.config["strict"] = False
+        plugin.on_config(mkdocs_config)
+
+        plugin.on_files(Files([make_doc_file("010--intro.md"), make_doc_file("020--intro.md")]), mkdocs_config)
+        assert plugin.collisions == {"intro.md": ["010--intro.md", "020--intro.md"]}
+
+        remaining = make_doc_file("010--intro.md")
+        plugin.on_files(Files([remaining]), mkdocs_config)
+
+        assert len(plugin.collisions) == 0
+        assert remaining.url == "intro/"
+
+    def test_path_index_queries(self, plugin, mkdocs_config):
+        """Test querying the path index and that links to indexed pages are left to MkDocs."""
+        plugin.config["strip_links"] = True
+        plugin.on_config(mkdocs_config)
+
+        page_file = make_doc_file("010--guide/010--intro.md")
+        setup_file = make_doc_file("010--guide/020--setup.md")
+        plugin.on_files(Files([page_file, setup_file, make_doc_file("about.md")]), mkdocs_config)
+
+        assert plugin.path_index.clean("010--guide/020--setup.md") == "guide/setup.md"
+        assert plugin.path_index.sources("guide/setup.md") == ["010--guide/020--setup.md"]
+        assert plugin.path_index.children("010--guide") == {
+            "010--intro.md": "intro.md",
+            "020--setup.md": "setup.md",
+        }
+
+        page = Mock(spec=Page)
+        page.file = page_file
+        markdown = (
+            "[Setup](020--setup.md#install) [Home](../about.md) [Root](/010--guide/020--setup.md)"
+        )
+
+        result = plugin.on_page_markdown(markdown, page, mkdocs_config, Files([]))
+
+        # MkDocs resolves links to known pages by source path to their clean URL.
+        assert result == markdown
+
+    def test_strict_collision_fails_on_first_collision(self, plugin, mkdocs_config):
+        """Test that strict mode stops as soon as the second claimant appears."""
+        plugin.on_config(mkdocs_config)
+
+        names = ("010--intro.md", "020--intro.md", "030--setup.md")
+        files = Files([make_doc_file(p) for p in names])
+        with patch.object(plugin, "_clean_file_paths", wraps=plugin._clean_file_paths) as spy:
+            with pytest.raises(PluginError, match=r"Multiple files would map to 'intro\.md'"):
+                plugin.on_files(files, mkdocs_config)
+
+        assert spy.call_count == 2
+        assert plugin.collisions.messages() == [
+            "Multiple files would map to 'intro.md': 010--intro.md, 020--intro.md"
+        ]
+
+    def test_unchanged_collision_reported_on_rebuild(self, plugin, mkdocs_config):
+        """Test that a collision left in place still fails the next build."""
+        plugin.on_config(mkdocs_config)
+        names = ("010--intro.md", "020--intro.md")
+
+        with pytest.raises(PluginError):
+            plugin.on_files(Files([make_doc_file(p) for p in names]), mkdocs_config)
+        with pytest.raises(PluginError, match=r"Multiple files would map to 'intro\.md'"):
+            plugin.on_files(Files([make_doc_file(p) for p in names]), mkdocs_config)
+
+    def test_link_rewriting_prefilter(self, plugin, mkdocs_config):
+        """Test that pages without .md links skip the link regex entirely."""
+        plugin.config["strip_links"] = True
+        plugin.on_config(mkdocs_config)
+        pattern = plugin.link_pattern
+        page = Mock(spec=Page)
+
+        plugin.link_pattern = Mock(wraps=pattern)
+        plain = "No links here, only [external](https://example.com)."
+        assert plugin.on_page_markdown(plain, page, mkdocs_config, Files([])) == plain
+        plugin.link_pattern.sub.assert_not_called()
+
+        result = plugin.on_page_markdown("[Intro](010--intro.md)", page, mkdocs_config, Files([]))
+        assert result == "[Intro](intro.md)"
+        assert plugin.metrics.pages_scanned == 2
+        assert plugin.metrics.pages_skipped == 1
+        assert plugin.metrics.links_rewritten == 1
+        assert plugin.metrics.hook_seconds["on_page_markdown"] > 0
+
+        plugin.on_config(mkdocs_config)
+        assert plugin.metrics.pages_scanned == 0
+
+    def test_link_rewriting_resolves_against_page(self, plugin, mkdocs_config):
+        """Test that relative links are resolved from the page's own source path."""
+        plugin.config["strip_links"] = True
+        plugin.on_config(mkdocs_config)
+
+        page_file = make_doc_file("030--other/010--page.md")
+        names = (
+            "010--guide/020--x.md",
+            "010--guide/030--y/010--z.md",
+            "030--other/020--sibling.md",
+        )
+        plugin.on_files(Files([page_file, *(make_doc_file(p) for p in names)]), mkdocs_config)
+
+        assert plugin.link_map["010--guide/020--x.md"] == "guide/x/"
+
+        page = Mock(spec=Page)
+        page.file = page_file
+        markdown = (
+            "[X](../010--guide/020--x.md) [Z](../010--guide/./030--y/010--z.md#top) "
+            "[Sibling](020--sibling.md) [Self](./010--page.md) [Gone](../010--guide/999--gone.md)"
+        )
+
+        result = plugin.on_page_markdown(markdown, page, mkdocs_config, Files([]))
+
+        assert result == markdown.replace("999--gone.md", "gone.md")
+
+    def test_on_nav_deep_tree(self, plugin, mkdocs_config):
+        """Test that navigation deeper than the recursion limit is cleaned."""
+        plugin.on_config(mkdocs_config)
+
+        root = current = Mock(title="010 Level", children=[])
+        for _ in range(sys.getrecursionlimit() + 100):
+            child = Mock(title="010 Level", children=[])
+            current.children = [child, Mock(title="020--leaf-page", children=None)]
+            current = child
+
+        plugin.on_nav(Mock(items=[root]), mkdocs_config, Files([]))
+
+        assert root.title == "Level"
+        assert current.title == "Level"
+        assert root.children[1].title == "leaf page"
+
+    def test_build_metrics_summary_and_file(self, plugin, mkdocs_config, tmp_path):
+        """Test that build metrics are reported once and written as JSON."""
+        plugin.config["metrics"] = True
+        plugin.config["metrics_file"] = str(tmp_path / "metrics.json")
+        plugin.on_config(mkdocs_config)
+
+        files = Files([make_doc_file("010--guide/020--setup.md"), make_doc_file("about.md")])
+        plugin.on_files(files, mkdocs_config)
+        section = Mock(title="010 Guide", children=[])
+        plugin.on_nav(Mock(items=[section]), mkdocs_config, files)
+
+        with patch("mkdocs_strip_number_prefix.plugin.logger") as mock_logger:
+            plugin.on_post_build(mkdocs_config)
+
+        assert mock_logger.info.call_count == 1
+        assert "1/2 files transformed" in mock_logger.info.call_args.args[0]
+
+        metrics = json.loads((tmp_path / "metrics.json").read_text())
+        assert metrics["files_scanned"] == 2
+        assert metrics["files_transformed"] == 1
+        assert metrics["files_recomputed"] == 2
+        assert metrics["nav_titles_changed"] == 1
+        assert metrics["components_cleaned"] > 0
+        assert set(metrics["hook_seconds"]) == {"on_config", "on_files", "on_nav"}
+
+    def test_parallel_workers_match_sequential(self, plugin, mkdocs_config):
+        """Test that cleaning in a process pool gives the same result as sequentially."""
+        names = [f"{i // 10:03d}--section/{i:03d}--page-{i}.md" for i in range(40)]
+
+        sequential = StripNumberPrefixPlugin()
+        sequential.config = dict(plugin.config)
+        sequential.on_config(mkdocs_config)
+        expected = [make_doc_file(p) for p in names]
+        sequential.on_files(Files(expected), mkdocs_config)
+
+        plugin.config["workers"] = 2
+        plugin.on_config(mkdocs_config)
+        files = [make_doc_file(p) for p in names]
+        with patch("mkdocs_strip_number_prefix.plugin.PARALLEL_MIN_FILES", 10):
+            with patch.object(plugin, "_clean_file_paths") as sequential_clean:
+                plugin.on_files(Files(files), mkdocs_config)
+
+        sequential_clean.assert_not_called()
+        assert [(f.dest_path, f.url) for f in files] == [(f.dest_path, f.url) for f in expected]
+        assert plugin.processed_files == sequential.processed_files
+
+    def test_parallel_workers_report_collisions(self, plugin, mkdocs_config):
+        """Test that collisions found after parallel cleaning are still reported."""
+        plugin.config["workers"] = 2
+        plugin.on_config(mkdocs_config)
+        names = [f"{i:03d}--page-{i}.md" for i in range(20)] + ["999--page-3.md"]
+
+        with patch("mkdocs_strip_number_prefix.plugin.PARALLEL_MIN_FILES", 10):
+            expected = r"'page-3\.md': 003--page-3\.md, 999--page-3\.md"
+            with pytest.raises(PluginError, match=expected):
+                plugin.on_files(Files([make_doc_file(p) for p in names]), mkdocs_config)
+
+    def test_parallel_link_prepass(self, plugin, mkdocs_config, tmp_path):
+        """Test that pages rewritten up front are served from the pre-pass results."""
+        plugin.config["strip_links"] = True
+        plugin.config["workers"] = 2
+        plugin.on_config(mkdocs_config)
+
+        docs_dir = tmp_path / "docs"
+        (docs_dir / "010--guide").mkdir(parents=True)
+        for i in range(12):
+            page = docs_dir / "010--guide" / f"{i:03d}--page-{i}.md"
+            page.write_text(f"[Draft]({i:03d}--draft-{i}.md)\n", encoding="utf-8")
+        site_dir = str(tmp_path / "site")
+        files = Files(
+            [File(f"010--guide/{i:03d}--page-{i}.md", str(docs_dir), site_dir, True) for i in range(12)]
+        )
+
+        with patch("mkdocs_strip_number_prefix.plugin.PARALLEL_MIN_FILES", 10):
+            plugin.on_files(files, mkdocs_config)
+
+        page = Mock(spec=Page)
+        page.file = files.documentation_pages()[0]
+        with patch.object(plugin.link_rewriter, "rewrite") as rewrite:
+            result = plugin.on_page_markdown("[Draft](000--draft-0.md)\n", page, mkdocs_config, files)
+        rewrite.assert_not_called()
+        assert result == "[Draft](draft-0.md)\n"
+        assert plugin.metrics.links_rewritten == 1
+
+        # Markdown changed by another plugin is rewritten normally.
+        page.file = files.documentation_pages()[1]
+        result = plugin.on_page_markdown("[Draft](000--draft-0.md)\n", page, mkdocs_config, files)
+        assert result == "[Draft](draft-0.md)\n"
+
+    def test_link_cache_reuses_rewritten_pages(self, plugin, mkdocs_config):
+        """Test that unchanged pages are served from the link cache."""
+        plugin.config["strip_links"] = True
+        plugin.config["link_cache_size"] = 2
+        plugin.on_startup(command="serve", dirty=False)
+        plugin.on_config(mkdocs_config)
+        docs = [make_doc_file("010--intro.md"), make_doc_file("020--setup.md")]
+        plugin.on_files(Files(docs), mkdocs_config)
+
+        page = Mock(spec=Page)
+        page.file = make_doc_file("010--intro.md")
+        markdown = "[Draft](030--draft.md)"
+        assert plugin.on_page_markdown(markdown, page, mkdocs_config, Files([])) == "[Draft](draft.md)"
+
+        with patch.object(plugin.link_rewriter, "rewrite") as rewrite:
+            result = plugin.on_page_markdown(markdown, page, mkdocs_config, Files([]))
+        rewrite.assert_not_called()
+        assert result == "[Draft](draft.md)"
+        assert (plugin.metrics.link_cache_hits, plugin.metrics.link_cache_misses) == (1, 1)
+        assert plugin.metrics.links_rewritten == 2
+
+        # A different link map invalidates every rewritten page.
+        plugin.on_config(mkdocs_config)
+        docs = [make_doc_file("010--intro.md"), make_doc_file("030--setup.md")]
+        plugin.on_files(Files(docs), mkdocs_config)
+        assert len(plugin.link_cache.entries) == 0
+
+        # The cache is bounded: the least recently used page is evicted.
+        for i in range(3):
+            plugin.on_page_markdown(f"[Draft {i}](030--draft.md)", page, mkdocs_config, Files([]))
+        assert len(plugin.link_cache.entries) == 2
+
+    def test_link_cache_only_when_reusable(self, plugin, mkdocs_config, tmp_path):
+        """Test that a one-shot build without ``cache`` keeps no rewritten pages."""
+        plugin.config["strip_links"] = True
+        plugin.on_startup(command="build", dirty=False)
+        plugin.on_config(mkdocs_config)
+        assert plugin.link_cache is None
+
+        plugin.config.update(cache=True, cache_dir=str(tmp_path / "cache"))
+        plugin.on_config(mkdocs_config)
+        assert plugin.link_cache is not None
+
+    def test_link_cache_persists_between_builds(self, plugin, mkdocs_config, tmp_path):
+        """Test that with ``cache`` enabled rewritten pages survive a fresh build."""
+        plugin.config.update(
+            strip_links=True, link_cache_size=16, cache=True, cache_dir=str(tmp_path / "cache")
+        )
+        docs = ["010--intro.md", "020--setup.md"]
+        page = Mock(spec=Page)
+        page.file = make_doc_file("010--intro.md")
+
+        plugin.on_config(mkdocs_config)
+        plugin.on_files(Files([make_doc_file(p) for p in docs]), mkdocs_config)
+        plugin.on_page_markdown("[Draft](030--draft.md)", page, mkdocs_config, Files([]))
+        plugin.on_post_build(mkdocs_config)
+        assert (tmp_path / "cache" / "links.json").exists()
+
+        warm = StripNumberPrefixPlugin()
+        warm.config = dict(plugin.config)
+        warm.on_config(mkdocs_config)
+        warm.on_files(Files([make_doc_file(p) for p in docs]), mkdocs_config)
+        result = warm.on_page_markdown("[Draft](030--draft.md)", page, mkdocs_config, Files([]))
+
+        assert result == "[Draft](draft.md)"
+        assert warm.metrics.link_cache_hits == 1
+
+    @pytest.mark.parametrize("use_directory_urls", [True, False])
+    def test_end_to_end_links_resolve(self, tmp_path, caplog, use_directory_urls):
+        """Test that every rewritten link form still resolves in a real build."""
+        from mkdocs.commands.build import build
+        from mkdocs.config import load_config
+
+        docs_dir = tmp_path / "docs"
+        (docs_dir / "010--guide").mkdir(parents=True)
+        (docs_dir / "020--api").mkdir()
+        (docs_dir / "index.md").write_text(
+            "# Home\n\n"
+            "[Intro](010--guide/010--intro.md) [Ref][ref] "
+            "[![Logo](img/logo.png)](020--api/010--ref.md#usage)\n\n"
+            '<a href="020--api/010--ref.md#usage">Raw</a>\n\n'
+            "[ref]: 020--api/010--ref.md\n",
+            encoding="utf-8",
+        )
+        (docs_dir / "010--guide" / "010--intro.md").write_text(
+            "# Intro\n\n[Ref](../020--api/010--ref.md#usage) [Home](../index.md)\n\n"
+            "[home]: ../index.md\n\n"
+            "<a href='../020--api/010--ref.md'>Raw</a>\n",
+            encoding="utf-8",
+        )
+        (docs_dir / "img").mkdir()
+        (docs_dir / "img" / "logo.png").write_bytes(b"")
+        (docs_dir / "020--api" / "010--ref.md").write_text(
+            "# Ref\n\n## Usage\n", encoding="utf-8"
+        )
+        config_file = tmp_path / "mkdocs.yml"
+        config_file.write_text(
+            "site_name: Links\n"
+            f"use_directory_urls: {str(use_directory_urls).lower()}\n"
+            "plugins:\n  - strip-number-prefix:\n      strip_links: true\n",
+            encoding="utf-8",
+        )
+
+        with caplog.at_level("INFO"):
+            build(load_config(config_file=str(config_file)))
+
+        messages = [record.getMessage() for record in caplog.records]
+        assert not [m for m in messages if "not found" in m or "unrecognized" in m]
+        assert not [r for r in caplog.records if r.levelname == "WARNING"]
+
+        site_dir = tmp_path / "site"
+        index_name = "index.html"
+        if use_directory_urls:
+            intro_html = site_dir / "guide" / "intro" / index_name
+            ref_url = "api/ref/"
+        else:
+            intro_html = site_dir / "guide" / "intro.html"
+            ref_url = "api/ref.html"
+        index = (site_dir / index_name).read_text(encoding="utf-8")
+        intro = intro_html.read_text(encoding="utf-8")
+        assert ".md" not in index + intro
+        assert "010--" not in index + intro
+        assert f'href="{ref_url}#usage">Raw</a>' in index
+        assert f"href='../{'../' if use_directory_urls else ''}{ref_url}'>Raw</a>" in intro
+
+    def test_html_link_mode(self, plugin, mkdocs_config):
+        """Test that ``strip_links: html`` rewrites the rendered HTML instead of the markdown."""
+        plugin.config["strip_links"] = "html"
+        plugin.on_config(mkdocs_config)
+        docs = [make_doc_file("010--guide/010--intro.md"), make_doc_file("010--guide/020--setup.md")]
+        plugin.on_files(Files(docs), mkdocs_config)
+
+        page = Mock(spec=Page)
+        page.file = docs[0]
+        markdown = "[Setup](020--setup.md)"
+        assert plugin.on_page_markdown(markdown, page, mkdocs_config, Files([])) == markdown
+
+        html = '<p><a href="../020--setup/#x">Setup</a> <img src="/010--guide/020--setup/"></p>'
+        result = plugin.on_page_content(html, page, mkdocs_config, Files([]))
+
+        assert result == '<p><a href="../setup/#x">Setup</a> <img src="/guide/setup/"></p>'
+        assert plugin.metrics.links_rewritten == 2
+
+    def test_invalid_strip_links_value(self, plugin, mkdocs_config):
+        """Test that unknown ``strip_links`` modes are rejected."""
+        plugin.config["strip_links"] = "everything"
+
+        with pytest.raises(PluginError, match="Invalid strip_links value 'everything'"):
+            plugin.on_config(mkdocs_config)
+
+    def test_fix_site_rewrites_built_files(self, plugin, mkdocs_config, tmp_path):
+        """Test that ``fix_site`` rewrites old URLs left in the built site."""
+        plugin.config["fix_site"] = True
+        mkdocs_config["site_dir"] = str(tmp_path)
+        plugin.on_config(mkdocs_config)
+        plugin.on_files(Files([make_doc_file("010--guide/020--setup.md")]), mkdocs_config)
+
+        (tmp_path / "search").mkdir()
+        index = tmp_path / "search" / "search_index.json"
+        index.write_text('{"docs": [{"location": "010--guide/020--setup/#x"}]}', encoding="utf-8")
+        plugin.on_post_build(mkdocs_config)
+
+        assert index.read_text(encoding="utf-8") == '{"docs": [{"location": "guide/setup/#x"}]}'
+        assert (plugin.metrics.site_files_fixed, plugin.metrics.site_urls_fixed) == (1, 1)
+        assert "fix_site" in plugin.metrics.hook_seconds
+
+    def test_redirects_written_after_build(self, plugin, mkdocs_config, tmp_path):
+        """Test that ``redirects`` writes the redirect files in ``on_post_build``."""
+        plugin.config["redirects"] = ["html", "json"]
+        mkdocs_config["site_dir"] = str(tmp_path)
+        mkdocs_config["site_url"] = "https://example.com/docs/"
+        plugin.on_config(mkdocs_config)
+        plugin.on_files(Files([make_doc_file("010--intro.md")]), mkdocs_config)
+        plugin.on_post_build(mkdocs_config)
+
+        assert (tmp_path / "010--intro" / "index.html").exists()
+        redirects = json.loads((tmp_path / "redirects.json").read_text(encoding="utf-8"))
+        assert redirects == {"/docs/010--intro/": "/docs/intro/"}
+        assert plugin.metrics.redirects_written == 2
+
+    def test_invalid_redirects_format(self, plugin, mkdocs_config):
+        """Test that unknown redirect formats are rejected."""
+        plugin.config["redirects"] = ["apache"]
+
+        with pytest.raises(PluginError, match="Invalid redirects format 'apache'"):
+            plugin.on_config(mkdocs_config)
+
+    def test_manifest_file(self, plugin, mkdocs_config, tmp_path):
+        """Test that ``manifest_file`` lists every page as JSON Lines."""
+        plugin.config["manifest_file"] = str(tmp_path / "manifest.jsonl")
+        plugin.on_config(mkdocs_config)
+        docs = [make_doc_file("010--guide/020--setup.md"), make_doc_file("index.md")]
+        plugin.on_files(Files(docs), mkdocs_config)
+
+        nav_page = Mock(spec=["title", "file"])
+        nav_page.title = "020--Setup"
+        nav_page.file = docs[0]
+        section = Mock(spec=["title", "children"])
+        section.title = "Guide"
+        section.children = [nav_page]
+        plugin.on_nav(Mock(items=[section]), mkdocs_config, Files(docs))
+        plugin.on_post_build(mkdocs_config)
+
+        lines = (tmp_path / "manifest.jsonl").read_text(encoding="utf-8").splitlines()
+        assert [json.loads(line) for line in lines] == [
+            {
+                "src_path": "010--guide/020--setup.md",
+                "clean_path": "guide/setup.md",
+                "dest_path": "guide/setup/index.html",
+                "url": "guide/setup/",
+                "title": "Setup",
+            },
+            {
+                "src_path": "index.md",
+                "clean_path": "index.md",
+                "dest_path": "index/index.html",
+                "url": "index/",
+                "title": None,
+            },
+        ]
+
+    def test_import_defers_optional_modules(self):
+        """Test that importing the plugin does not load modules only some builds need."""
+        code = (
+            "import sys\n"
+            "import mkdocs_strip_number_prefix.plugin\n"
+            "print('\\n'.join(sorted(sys.modules)))\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        loaded = set(result.stdout.split())
+
+        deferred = {
+            "concurrent.futures.process",
+            "mkdocs_strip_number_prefix.assets",
+            "mkdocs.structure.pages",
+            "mkdocs_strip_number_prefix.cache",
+            "mkdocs_strip_number_prefix.html_links",
+            "mkdocs_strip_number_prefix.manifest",
+            "mkdocs_strip_number_prefix.redirects",
+            "mkdocs_strip_number_prefix.site_links",
+        }
+        assert not deferred & loaded
+
+    def test_metrics_shown_by_mkdocs(self, tmp_path):
+        """Test that the metrics summary reaches the MkDocs console log."""
+        (tmp_path / "docs").mkdir()
+        (tmp_path / "docs" / "010--intro.md").write_text("# Intro\n", encoding="utf-8")
+        (tmp_path / "mkdocs.yml").write_text(
+            "site_name: Metrics\nplugins:\n  - strip-number-prefix:\n      metrics: true\n",
+            encoding="utf-8",
+        )
+
+        result = subprocess.run(
+            [sys.executable, "-m", "mkdocs", "build", "-f", str(tmp_path / "mkdocs.yml")],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        assert "StripNumberPrefix: 1/1 files transformed" in result.stderr
+
+    def test_strip_assets(self, plugin, mkdocs_config):
+        """Test that ``strip_assets`` publishes static files under cleaned directories."""
+        plugin.config["strip_assets"] = True
+        plugin.on_config(mkdocs_config)
+        paths = ["010--guide/020--setup.md", "010--guide/010--img/a b.png", "logo.png"]
+        files = Files([File(path, "/docs", "/site", True) for path in paths])
+
+        plugin.on_files(files, mkdocs_config)
+
+        image = files.get_file_from_path("010--guide/010--img/a b.png")
+        assert image.dest_path == os.path.join("guide", "img", "a b.png")
+        assert image.url == "guide/img/a%20b.png"
+        assert image.abs_dest_path == os.path.normpath("/site/guide/img/a b.png")
+        assert files.get_file_from_path("logo.png").dest_path == "logo.png"
+        assert plugin.asset_map == {
+            "010--guide/010--img/a b.png": ("010--guide/010--img/a%20b.png", "guide/img/a%20b.png")
+        }
+        assert plugin.metrics.assets_relocated == 1
+
+    def test_strip_assets_html_links(self, plugin, mkdocs_config):
+        """Test that ``strip_links: html`` follows relocated assets in raw HTML."""
+        plugin.config.update(strip_assets=True, strip_links="html")
+        plugin.on_config(mkdocs_config)
+        paths = ["010--guide/020--setup.md", "010--guide/010--img/a b.png"]
+        files = Files([File(path, "/docs", "/site", True) for path in paths])
+        plugin.on_files(files, mkdocs_config)
+
+        page = Mock(spec=Page)
+        page.file = files.get_file_from_path("010--guide/020--setup.md")
+        html = '<p><img src="../010--img/a%20b.png"> <a href="/010--guide/010--img/a%20b.png">'
+        result = plugin.on_page_content(html, page, mkdocs_config, Files([]))
+
+        assert result == '<p><img src="../img/a%20b.png"> <a href="/guide/img/a%20b.png">'
+
+    def test_strip_assets_collision(self, plugin, mkdocs_config):
+        """Test that assets whose cleaned paths collide stay where they are."""
+        plugin.config.update(strip_assets=True, strict=False)
+        plugin.on_config(mkdocs_config)
+        paths = ["010--img/a.png", "020--img/a.png", "010--img/b.png"]
+        files = Files([File(path, "/docs", "/site", True) for path in paths])
+
+        with patch("mkdocs_strip_number_prefix.plugin.logger") as mock_logger:
+            plugin.on_files(files, mkdocs_config)
+
+        assert [file.dest_path for file in files] == [
+            os.path.join("010--img", "a.png"),
+            os.path.join("020--img", "a.png"),
+            os.path.join("img", "b.png"),
+        ]
+        mock_logger.warning.assert_called_once()
+
+        plugin.config["strict"] = True
+        files = Files([File(path, "/docs", "/site", True) for path in paths])
+        with pytest.raises(PluginError, match="Multiple files would map to"):
+            plugin.on_files(files, mkdocs_config)
+
+    def test_asset_copy_hardlink(self, plugin, mkdocs_config, tmp_path):
+        """Test that relocated assets are hardlinked once and skipped when unchanged."""
+        plugin.config.update(strip_assets=True, asset_copy="hardlink")
+        plugin.on_config(mkdocs_config)
+        docs_dir, site_dir = tmp_path / "docs", tmp_path / "site"
+        (docs_dir / "010--media").mkdir(parents=True)
+        (docs_dir / "010--media" / "video.bin").write_bytes(b"x" * 1024)
+        (docs_dir / "logo.png").write_bytes(b"png")
+
+        def build():
+            paths = ("010--media/video.bin", "logo.png")
+            files = Files([File(p, str(docs_dir), str(site_dir), True) for p in paths])
+            plugin.on_files(files, mkdocs_config)
+            files.copy_static_files()
+
+        build()
+        video = site_dir / "media" / "video.bin"
+        assert video.stat().st_ino == (docs_dir / "010--media" / "video.bin").stat().st_ino
+        assert (site_dir / "logo.png").read_bytes() == b"png"  # not relocated: copied by MkDocs
+        assert (plugin.metrics.assets_linked, plugin.metrics.assets_skipped) == (1, 0)
+
+        build()
+        assert plugin.metrics.assets_skipped == 1
+
+    def test_hardlinked_assets_not_rewritten(self, plugin, mkdocs_config, tmp_path):
+        """Test that ``fix_site`` never writes through a hardlink into ``docs/``."""
+        docs_dir, site_dir = tmp_path / "docs", tmp_path / "site"
+        plugin.config.update(strip_assets=True, asset_copy="hardlink", fix_site=True)
+        mkdocs_config.update(site_dir=str(site_dir), site_url="https://example.com/docs/")
+        plugin.on_config(mkdocs_config)
+        (docs_dir / "010--guide").mkdir(parents=True)
+        text = '{"see": "/docs/010--guide/020--setup/"}'
+        for name in ("data.json", "video.bin"):
+            (docs_dir / "010--guide" / name).write_text(text, encoding="utf-8")
+        paths = ("010--guide/020--setup.md", "010--guide/data.json", "010--guide/video.bin")
+        files = Files([File(p, str(docs_dir), str(site_dir), True) for p in paths])
+        plugin.on_files(files, mkdocs_config)
+        files.copy_static_files()
+
+        # An earlier build without ``fix_site`` may have left a hardlink behind.
+        os.link(docs_dir / "010--guide" / "video.bin", site_dir / "guide" / "page.html")
+        plugin.on_post_build(mkdocs_config)
+
+        assert (docs_dir / "010--guide" / "data.json").read_text(encoding="utf-8") == text
+        assert (docs_dir / "010--guide" / "video.bin").read_text(encoding="utf-8") == text
+        assert (site_dir / "guide" / "data.json").read_text(encoding="utf-8") == (
+            '{"see": "/docs/guide/setup/"}'
+        )
+        assert (site_dir / "guide" / "video.bin").stat().st_nlink == 3
+        assert plugin.metrics.site_files_fixed == 1
+
+    def test_invalid_asset_copy_strategy(self, plugin, mkdocs_config):
+        """Test that unknown ``asset_copy`` strategies are rejected."""
+        plugin.config["asset_copy"] = "rsync"
+
+        with pytest.raises(PluginError, match="Invalid asset_copy strategy 'rsync'"):
+            plugin.on_config(mkdocs_config)
+
+    def test_patterns_must_be_strings(self):
+        """Test that a non-string ``patterns`` entry is a config error, not a crash."""
+        plugin = StripNumberPrefixPlugin()
+
+        errors, _ = plugin.load_config({"patterns": [r"^\d+--", 20240101]})
+
+        assert [name for name, _ in errors] == ["patterns"]
+        assert "Expected type: <class 'str'>" in str(errors[0][1])
+
+    def test_multiple_patterns(self, plugin, mkdocs_config):
+        """Test that ``patterns`` strips several prefix conventions."""
+        plugin.config["patterns"] = [r"^\d+--", r"^\d+_"]
+        plugin.on_config(mkdocs_config)
+        docs = [make_doc_file("010--guide/020_setup.md"), make_doc_file("030_about.md")]
+
+        plugin.on_files(Files(docs), mkdocs_config)
+
+        assert [doc.url for doc in docs] == ["guide/setup/", "about/"]
+
+        plugin.config["patterns"] = [r"^\d+--", r"^[\d+_"]
+        with pytest.raises(PluginError, match=r"Invalid regex pattern '\^\[\\d\+_'"):
+            plugin.on_config(mkdocs_config)
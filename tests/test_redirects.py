@@ -0,0 +1,46 @@
+# this_file: more/mkdocs-plugins/vexy-mkdocs-strip-number-prefix/tests/test_redirects.py
+"""Tests for the redirects from old prefixed URLs."""
+
+import json
+
+from mkdocs_strip_number_prefix.redirects import render_redirects, write_redirects
+
+URL_MAP = {
+    "010--guide/020--setup.md": ("010--guide/020--setup/", "guide/setup/"),
+    "030--about.md": ("030--about.html", "about.html"),
+}
+
+
+class TestRedirects:
+    """Test cases for the redirect renderers."""
+
+    def test_html_stubs(self):
+        """Test that every old URL gets a stub pointing at the new URL."""
+        outputs = render_redirects(URL_MAP, ["html"])
+
+        assert sorted(outputs) == ["010--guide/020--setup/index.html", "030--about.html"]
+        assert 'content="0; url=../../guide/setup/"' in outputs["010--guide/020--setup/index.html"]
+        assert 'href="about.html"' in outputs["030--about.html"]
+
+    def test_map_files(self):
+        """Test the JSON and nginx maps under the path the site is served from."""
+        outputs = render_redirects(URL_MAP, ["json", "nginx"], "/docs/")
+
+        assert json.loads(outputs["redirects.json"]) == {
+            "/docs/010--guide/020--setup/": "/docs/guide/setup/",
+            "/docs/030--about.html": "/docs/about.html",
+        }
+        assert outputs["redirects.map"] == (
+            "/docs/010--guide/020--setup/ /docs/guide/setup/;\n"
+            "/docs/030--about.html /docs/about.html;\n"
+        )
+
+    def test_write_keeps_built_pages(self, tmp_path):
+        """Test that stubs never replace a page the build produced."""
+        (tmp_path / "030--about.html").write_text("page", encoding="utf-8")
+        outputs = render_redirects(URL_MAP, ["html", "json"])
+
+        assert write_redirects(str(tmp_path), outputs) == 2
+        assert (tmp_path / "030--about.html").read_text(encoding="utf-8") == "page"
+        assert (tmp_path / "010--guide" / "020--setup" / "index.html").exists()
+        assert (tmp_path / "redirects.json").exists()
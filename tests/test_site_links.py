@@ -0,0 +1,142 @@
+# this_file: more/mkdocs-plugins/vexy-mkdocs-strip-number-prefix/tests/test_site_links.py
+"""Tests for the post-build site link fixer."""
+
+import os
+import pickle
+
+import pytest
+
+from mkdocs_strip_number_prefix import site_links
+from mkdocs_strip_number_prefix.site_links import (
+    SiteLinkFixer,
+    fix_files_chunk,
+    init_worker,
+    iter_site_files,
+)
+
+
+@pytest.fixture
+def fixer(tmp_path):
+    """Create a fixer for a small tree of transformed pages built into ``tmp_path``."""
+    return SiteLinkFixer(
+        {
+            "010--guide/": "guide/",
+            "010--guide/020--setup/": "guide/setup/",
+            "030--about.html": "about.html",
+        },
+        str(tmp_path),
+        "https://example.com/",
+    )
+
+
+class TestSiteLinkFixer:
+    """Test cases for SiteLinkFixer."""
+
+    def test_fix_file(self, fixer, tmp_path):
+        """Test that old URLs are replaced in every URL context."""
+        page = tmp_path / "index.html"
+        page.write_text(
+            '<a href="/010--guide/020--setup/#x">a</a> <a href="./010--guide/">b</a>\n'
+            "<loc>https://example.com/010--guide/020--setup/</loc> 030--about.html?q\n"
+            '{"location": "010--guide/020--setup/index.html"}\n',
+            encoding="utf-8",
+        )
+
+        assert fixer.fix_file(str(page)) == 5
+        assert page.read_text(encoding="utf-8") == (
+            '<a href="/guide/setup/#x">a</a> <a href="guide/">b</a>\n'
+            "<loc>https://example.com/guide/setup/</loc> about.html?q\n"
+            '{"location": "guide/setup/index.html"}\n'
+        )
+
+    def test_fix_file_resolves_relative_urls(self, fixer, tmp_path):
+        """Test that relative URLs are resolved against the page's directory."""
+        page_dir = tmp_path / "guide" / "other"
+        page_dir.mkdir(parents=True)
+        page = page_dir / "index.html"
+        page.write_text(
+            '<a href="../../010--guide/020--setup/">a</a> <a href="../../030--about.html">b</a>\n'
+            '<a href="/010--guide/">c</a> <a href="../020--setup/">d</a>\n',
+            encoding="utf-8",
+        )
+
+        assert fixer.fix_file(str(page)) == 3
+        assert page.read_text(encoding="utf-8") == (
+            '<a href="../setup/">a</a> <a href="../../about.html">b</a>\n'
+            '<a href="/guide/">c</a> <a href="../020--setup/">d</a>\n'
+        )
+
+    def test_fix_file_does_not_match_relative_suffixes(self, fixer, tmp_path):
+        """Test that a relative URL ending in a root-level old URL is left alone."""
+        page_dir = tmp_path / "guide"
+        page_dir.mkdir()
+        page = page_dir / "index.html"
+        text = '<a href="010--guide/">a</a> <a href="../../010--guide/">b</a>'
+        page.write_text(text, encoding="utf-8")
+
+        assert fixer.fix_file(str(page)) == 0
+        assert page.read_text(encoding="utf-8") == text
+
+    def test_fix_file_leaves_other_files_alone(self, fixer, tmp_path):
+        """Test that files without an old URL are not rewritten."""
+        page = tmp_path / "page.html"
+        text = '<a href="/x010--guide/">a</a> <img src="010--guide/020--setup/img.png"> '
+        page.write_text(text, encoding="utf-8")
+        empty = tmp_path / "empty.json"
+        empty.write_bytes(b"")
+        mtime = page.stat().st_mtime_ns
+
+        assert fixer.fix_file(str(page)) == 0
+        assert fixer.fix_file(str(empty)) == 0
+        assert page.read_text(encoding="utf-8") == text
+        assert page.stat().st_mtime_ns == mtime
+
+    def test_fix_file_leaves_other_sites_alone(self, fixer, tmp_path):
+        """Test that only URLs on the host and under the base path of ``site_url`` change."""
+        page = tmp_path / "index.html"
+        text = (
+            '<a href="https://github.com/org/repo/tree/main/010--guide/020--setup/">a</a>\n'
+            '<a href="//cdn.example.org/010--guide/">b</a> <a href="/docs/010--guide/">c</a>\n'
+        )
+        page.write_text(text + '<a href="https://EXAMPLE.com/010--guide/">d</a>', encoding="utf-8")
+
+        assert fixer.fix_file(str(page)) == 1
+        assert page.read_text(encoding="utf-8") == text + '<a href="https://EXAMPLE.com/guide/">d</a>'
+
+    def test_fix_file_under_base_path(self, tmp_path):
+        """Test that a ``site_url`` with a path only matches URLs below it."""
+        fixer = SiteLinkFixer({"010--guide/": "guide/"}, str(tmp_path), "https://example.com/docs/")
+        page = tmp_path / "index.html"
+        page.write_text(
+            '<a href="/docs/010--guide/">a</a> <a href="/010--guide/">b</a>\n'
+            "<loc>https://example.com/docs/010--guide/</loc>",
+            encoding="utf-8",
+        )
+
+        assert fixer.fix_file(str(page)) == 2
+        assert page.read_text(encoding="utf-8") == (
+            '<a href="/docs/guide/">a</a> <a href="/010--guide/">b</a>\n'
+            "<loc>https://example.com/docs/guide/</loc>"
+        )
+
+    def test_iter_site_files(self, tmp_path):
+        """Test that only files that can carry URLs are visited."""
+        (tmp_path / "search").mkdir()
+        for name in ("index.html", "sitemap.xml", "search/search_index.json", "style.css"):
+            (tmp_path / name).write_text("", encoding="utf-8")
+
+        found = sorted(os.path.relpath(p, tmp_path) for p in iter_site_files(str(tmp_path)))
+
+        assert found == ["index.html", os.path.join("search", "search_index.json"), "sitemap.xml"]
+
+    def test_fix_files_chunk(self, fixer, tmp_path, monkeypatch):
+        """Test fixing a chunk of files with a worker's pickled fixer."""
+        monkeypatch.setattr(site_links, "_worker_fixer", None)
+        page = tmp_path / "index.html"
+        page.write_text('<a href="/010--guide/">a</a>', encoding="utf-8")
+
+        with pytest.raises(RuntimeError):
+            fix_files_chunk([str(page)])
+
+        init_worker(pickle.loads(pickle.dumps(fixer)))
+        assert fix_files_chunk([str(page)]) == [1]
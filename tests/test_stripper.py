@@ -0,0 +1,128 @@
+# this_file: more/mkdocs-plugins/vexy-mkdocs-strip-number-prefix/tests/test_stripper.py
+"""Tests for the memoized prefix stripping engine."""
+
+import pickle
+import re
+
+import pytest
+
+from mkdocs_strip_number_prefix.stripper import (
+    PrefixStripper,
+    compile_patterns,
+    simple_prefix_stripper,
+)
+
+
+class TestPrefixStripper:
+    """Test cases for PrefixStripper."""
+
+    def test_clean_path(self):
+        """Test stripping every component of a path."""
+        stripper = PrefixStripper(re.compile(r"^\d+--"))
+
+        assert stripper.clean_path("010--guide/020--setup.md") == "guide/setup.md"
+        assert stripper.clean_path("guide/setup.md") == "guide/setup.md"
+        assert stripper.clean_path("010--guide\\020--setup.md", "\\") == "guide\\setup.md"
+
+    def test_clean_output_path_keeps_extension(self):
+        """Test that output paths keep extensions and trailing slashes."""
+        stripper = PrefixStripper(re.compile(r"^\d+--"))
+
+        assert stripper.clean_output_path("010--guide/020--setup/index.html") == "guide/setup/index.html"
+        assert stripper.clean_output_path("010--guide/020--setup.html") == "guide/setup.html"
+        assert stripper.clean_output_path("010--guide/020--setup/") == "guide/setup/"
+
+    def test_shared_components_are_memoized(self):
+        """Test that repeated components hit the cache instead of the regex."""
+        stripper = PrefixStripper(re.compile(r"^\d+--"))
+
+        for name in ("010--a.md", "020--b.md", "030--c.md"):
+            stripper.clean_path(f"010--guide/020--api/{name}")
+
+        hits, misses = stripper.cache_stats()
+        assert misses == 5  # two shared parents + three file names
+        assert hits == 4
+
+    def test_pickle_round_trip(self):
+        """Test that the engine can be shipped to worker processes."""
+        stripper = PrefixStripper(re.compile(r"^\d+--"), maxsize=16)
+        stripper.clean_path("010--guide/020--setup.md")
+
+        clone = pickle.loads(pickle.dumps(stripper))
+
+        assert clone.pattern.pattern == r"^\d+--"
+        assert clone.maxsize == 16
+        assert clone.cache_stats() == (0, 0)
+        assert clone.clean_path("010--guide/020--setup.md") == "guide/setup.md"
+
+    def test_clean_title(self):
+        """Test stripping both file-style and navigation-style title prefixes."""
+        stripper = PrefixStripper(re.compile(r"^\d+--"))
+
+        assert stripper.clean_title("010 Getting Started") == "Getting Started"
+        assert stripper.clean_title("020--api-reference") == "api reference"
+        assert stripper.clean_title("Overview") == "Overview"
+        assert stripper.clean_title("010--") == "010--"
+
+        stripper.clean_title("010 Getting Started")
+        assert stripper.clean_title.cache_info().hits == 1
+
+
+class TestCompilePatterns:
+    """Test cases for compile_patterns."""
+
+    def test_single_pattern_is_unchanged(self):
+        """Test that one pattern compiles as written."""
+        assert compile_patterns([r"^\d+--"]).pattern == r"^\d+--"
+
+    def test_conventions_combined(self):
+        """Test that several conventions are stripped by one combined pattern."""
+        stripper = PrefixStripper(
+            compile_patterns([r"^\d+--", r"^\d+_", r"(?i)^v\d+\.", r"^\d{4}-\d{2}-\d{2}-"])
+        )
+
+        assert stripper.clean_path("010--guide/020_setup.md") == "guide/setup.md"
+        assert stripper.clean_path("V2.api/2024-01-31-notes.md") == "api/notes.md"
+        assert stripper.clean_path("plain/readme.md") == "plain/readme.md"
+
+    def test_invalid_pattern_is_named(self):
+        """Test that the error points at the faulty pattern."""
+        with pytest.raises(re.error) as exc_info:
+            compile_patterns([r"^\d+--", r"^(\d+"])
+
+        assert exc_info.value.pattern == r"^(\d+"
+
+    @pytest.mark.parametrize("pattern", [r"^(\d+)--", r"^(?P<n>\d+)_", r"^(\d)\1-"])
+    def test_capturing_groups_rejected(self, pattern):
+        """Test that combined patterns may not capture, since groups would clash or shift."""
+        with pytest.raises(re.error, match="capturing groups") as exc_info:
+            compile_patterns([r"^\d+--", pattern])
+
+        assert exc_info.value.pattern == pattern
+
+    def test_single_pattern_may_capture(self):
+        """Test that a pattern used on its own keeps its groups."""
+        assert compile_patterns([r"^(\d)\1-"]).sub("", "11-a") == "a"
+
+
+class TestSimplePrefixStripper:
+    """Test cases for the regex-free fast path."""
+
+    @pytest.mark.parametrize("pattern", [r"^\d+--", r"^\d+-", r"^\d+_", r"^\d+\.", r"^\d{3}--"])
+    def test_matches_regex(self, pattern):
+        """Test that the scanner strips exactly what the regex strips."""
+        compiled = re.compile(pattern)
+        strip = simple_prefix_stripper(compiled)
+        samples = ["010--a.md", "1--2--x", "12-3--", "0010--a", "\u0663--a", "1.2.x", "010_b", "010--", "", "x"]
+
+        for text in samples:
+            expected = compiled.sub("", text) if compiled.match(text) else text
+            assert strip(text) == expected
+
+    @pytest.mark.parametrize("pattern", [r"^\d+\s+", r"^(?:\d+)--", r"(?i)^\d+--", r"^\d+--|^\d+_"])
+    def test_custom_patterns_use_regex(self, pattern):
+        """Test that other patterns keep using the regex engine."""
+        compiled = re.compile(pattern)
+
+        assert simple_prefix_stripper(compiled) is None
+        assert PrefixStripper(compiled).strip.__name__ == "_strip_with_regex"
@@ -0,0 +1,45 @@
+# this_file: more/mkdocs-plugins/vexy-mkdocs-strip-number-prefix/tests/test_transforms.py
+"""Tests for the table of page transformations."""
+
+import pytest
+
+from mkdocs_strip_number_prefix.transforms import Transformation, TransformTable
+
+
+@pytest.fixture
+def table():
+    """A table with one applied, one pending and one unchanged page."""
+    table = TransformTable()
+    table["010--guide/020--setup.md"] = Transformation(
+        "guide/setup.md", "guide/setup/index.html", "guide/setup/"
+    )
+    table["030--about.md"] = Transformation("about.md", "about/index.html", "about/")
+    table["index.md"] = Transformation("index.md", "index.html", "")
+    table["010--guide/020--setup.md"].old_url = "010--guide/020--setup/"
+    return table
+
+
+class TestTransformTable:
+    """Test cases for the views derived from the table."""
+
+    def test_records_are_slotted(self):
+        """Test that records carry no per-instance dict."""
+        record = Transformation("a.md", "a/index.html", "a/")
+
+        assert not hasattr(record, "__dict__")
+        assert record.old_url is None
+
+    def test_views_only_list_applied_records(self, table):
+        """Test that only records applied in this build show up in the views."""
+        assert [src_path for src_path, _ in table.applied()] == ["010--guide/020--setup.md"]
+        assert table.processed_files() == {"010--guide/020--setup.md": "guide/setup.md"}
+        assert table.url_map() == {
+            "010--guide/020--setup.md": ("010--guide/020--setup/", "guide/setup/")
+        }
+
+    def test_views_follow_records(self, table):
+        """Test that resetting a record between builds drops it from the views."""
+        table["010--guide/020--setup.md"].old_url = None
+        table["030--about.md"].old_url = "030--about/"
+
+        assert table.url_map() == {"030--about.md": ("030--about/", "about/")}